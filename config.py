@@ -2,15 +2,30 @@ import os, json
 
 CONFIG_FILE = "last_folder.json"
 
+# Folder last known to be on disk, so repeated saves of the same folder skip the write
+_last_written = None
+
 def load_last_folder():
+    global _last_written
     if os.path.exists(CONFIG_FILE):
         try:
             with open(CONFIG_FILE, "r") as f:
-                return json.load(f).get("last_folder", os.path.expanduser("~"))
+                folder = json.load(f).get("last_folder")
+            if folder is None:
+                return os.path.expanduser("~")
+            _last_written = folder  # already on disk
+            return folder
         except Exception:
             return os.path.expanduser("~")
     return os.path.expanduser("~")
 
 def save_last_folder(folder_path):
-    with open(CONFIG_FILE, "w") as f:
+    global _last_written
+    if folder_path == _last_written:
+        return
+    # Write to a temp file and swap it in so a crash never leaves a half-written config
+    tmp_file = CONFIG_FILE + ".tmp"
+    with open(tmp_file, "w") as f:
         json.dump({"last_folder": folder_path}, f)
+    os.replace(tmp_file, CONFIG_FILE)
+    _last_written = folder_path
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+
+class ArrayDEM:
+    """In-memory stand-in for dem_loader.DEM, backed by a 2D float32 array."""
+
+    def __init__(self, arr):
+        self._arr = np.ascontiguousarray(arr, dtype=np.float32)
+        self.height, self.width = self._arr.shape
+
+    def get_array(self):
+        return self._arr
+
+    def get_elevation(self, x, y):
+        if x < 0 or x >= self.width or y < 0 or y >= self.height:
+            return None
+        return self._arr[y, x]
+
+    def get_elevations_vec(self, xs, ys, fill=np.nan):
+        xs = np.asarray(xs).astype(np.intp)
+        ys = np.asarray(ys).astype(np.intp)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        z = self._arr[np.clip(ys, 0, self.height - 1), np.clip(xs, 0, self.width - 1)]
+        return np.where(inside, z, fill)
+
+
+@pytest.fixture
+def dem():
+    """200 x 200 DEM of smooth hills, 0-600 m."""
+    y, x = np.mgrid[0:200, 0:200]
+    return ArrayDEM(300 + 150 * np.sin(x / 17.0) + 150 * np.cos(y / 23.0))
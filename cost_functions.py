@@ -1,8 +1,17 @@
 from path import xyzPath
+import math
 import numpy as np
+from numba_compat import NUMBA_AVAILABLE
+from cost_functions_nb import re3_nb, acsm_nb, ihc_nb, re3_span_nb, acsm_span_nb, ihc_span_nb, make_delta
+from cost_functions_nb import re3_batch_nb, acsm_batch_nb, ihc_batch_nb
+
+LOG_1056 = math.log(1.056)
+LOG_1133 = math.log(1.133)
 
 def re3(path, time):
     """RE3 Running Equation"""
+    if NUMBA_AVAILABLE:
+        return re3_nb(path.get_points(), time)
                         
     segCount = path.get_point_count() - 1
     if segCount <= 0:
@@ -11,6 +20,7 @@ def re3(path, time):
     segTime = time * 3600 / segCount   # seconds per segment
     if segTime == 0:
         segTime = 1e-9  # avoid division-by-zero but keep tiny
+    inv_segTime = 1.0 / segTime
     
     segments = path.get_segments()
     dist = segments[:, 3]     # segment lengths
@@ -22,17 +32,23 @@ def re3(path, time):
     term2 = 1.39 * np.sum(dist)
     
     
-    term3 = 0.185 * np.sum((dist ** 2) / segTime)
+    term3 = 0.185 * inv_segTime * np.dot(dist, dist)
     
     
-    exponent1 = (rise/dist + 0.43)
-    exponent2 = (1 - 1.056 ** exponent1)
+    # 1.133 ** (1 - 1.056 ** (rise/dist + 0.43)), evaluated in place as exp/log
+    # so the whole chain reuses a single temporary instead of one per power
+    scratch = np.divide(rise, dist)
+    scratch += 0.43
+    scratch *= LOG_1056
+    np.exp(scratch, out=scratch)
+    np.subtract(1.0, scratch, out=scratch)
+    scratch *= LOG_1133
+    np.exp(scratch, out=scratch)
  
-    term4 = 30.43 * np.sum(rise * (1 - 1.133 ** exponent2))
+    term4 = 30.43 * (np.sum(rise) - np.dot(rise, scratch))
     
     totalCost = term1 + term2 + term3 + term4
     
-    print(totalCost)
     return totalCost
 
 
@@ -40,6 +56,8 @@ def re3(path, time):
 
 def acsm_equation(path, time):
     """ACSM Walking Equation"""
+    if NUMBA_AVAILABLE:
+        return acsm_nb(path.get_points(), time)
     segCount = path.get_point_count() - 1
     segTime = time * 3600 / (segCount) #Time is provided in hours, convert to seconds
     segments = path.get_segments()
@@ -50,9 +68,37 @@ def acsm_equation(path, time):
 
 def ihc(path, time):
     "I Hate To Climb Equation"
+    if NUMBA_AVAILABLE:
+        return ihc_nb(path.get_points(), time)
     segs = path.get_segments()
     dist = sum(segs[:,3])
     segDeltaZ = segs[:, 2] 
     segClimb = segDeltaZ[segDeltaZ > 0]
-    print(segDeltaZ)
-    return sum(segClimb) + dist/300
\ No newline at end of file
+    return sum(segClimb) + dist/300
+
+# Incremental form used by the solver for single-point moves; see cost_functions_nb.make_delta.
+# Attached as attributes so the plugin loader still only lists the cost functions themselves.
+re3.delta = make_delta(re3_span_nb)
+acsm_equation.delta = make_delta(acsm_span_nb)
+ihc.delta = make_delta(ihc_span_nb)
+# The span kernels themselves, for solvers that run their whole loop compiled
+# (solvers/compiledAnneal.py)
+re3.span = re3_span_nb
+acsm_equation.span = acsm_span_nb
+ihc.span = ihc_span_nb
+
+# Batched form batch(cands, time) -> costs for a (k, n, 3) stack of candidate
+# points. Only offered when compiled; the interpreted kernels would be slower
+# than calling the NumPy versions above one candidate at a time.
+if NUMBA_AVAILABLE:
+    re3.batch = re3_batch_nb
+    acsm_equation.batch = acsm_batch_nb
+    ihc.batch = ihc_batch_nb
+
+# Smallest point count at which `delta` beats one full call. Only set when
+# compiled: a compiled full cost is a single pass so cheap that the delta's
+# two span calls only pay off on long paths (sooner for RE3's pow terms).
+if NUMBA_AVAILABLE:
+    re3.delta_min_points = 200
+    acsm_equation.delta_min_points = 1000
+    ihc.delta_min_points = 1000
@@ -0,0 +1,175 @@
+"""
+Numba kernels for the cost functions in cost_functions.py.
+
+Each kernel takes the raw (N, 3) points array of a path plus the available
+time in hours and walks the points once, accumulating every term in scalars.
+No segments array is built. The public cost functions dispatch here when
+Numba is available. They release the GIL, so candidates can be scored on
+several threads at once.
+"""
+import math
+import numpy as np
+from numba_compat import njit, FASTMATH
+
+LOG_1056 = math.log(1.056)
+LOG_1133 = math.log(1.133)
+
+
+@njit(cache=True, nogil=True, fastmath=FASTMATH, error_model="numpy")
+def re3_nb(points, time):
+    """RE3 Running Equation over raw points."""
+    n = points.shape[0]
+    segCount = n - 1
+    if segCount <= 0:
+        return 0.0
+
+    segTime = time * 3600.0 / segCount
+    if segTime == 0.0:
+        segTime = 1e-9
+    inv_segTime = 1.0 / segTime
+
+    sum_dist = 0.0
+    sum_dist2 = 0.0
+    sum_climb = 0.0
+    for i in range(segCount):
+        dx = float(points[i + 1, 0]) - float(points[i, 0])
+        dy = float(points[i + 1, 1]) - float(points[i, 1])
+        rise = float(points[i + 1, 2]) - float(points[i, 2])
+        dist2 = dx * dx + dy * dy + rise * rise
+        dist = math.sqrt(dist2)
+        sum_dist += dist
+        sum_dist2 += dist2
+        inner = math.exp(LOG_1056 * (rise / dist + 0.43))
+        sum_climb += rise * (1.0 - math.exp(LOG_1133 * (1.0 - inner)))
+
+    return 4.43 * time + 1.39 * sum_dist + 0.185 * inv_segTime * sum_dist2 + 30.43 * sum_climb
+
+
+@njit(cache=True, nogil=True, fastmath=FASTMATH, error_model="numpy")
+def acsm_nb(points, time):
+    """ACSM Walking Equation over raw points."""
+    sum_dist = 0.0
+    sum_rise = 0.0
+    for i in range(points.shape[0] - 1):
+        dx = float(points[i + 1, 0]) - float(points[i, 0])
+        dy = float(points[i + 1, 1]) - float(points[i, 1])
+        dz = float(points[i + 1, 2]) - float(points[i, 2])
+        sum_dist += math.sqrt(dx * dx + dy * dy + dz * dz)
+        sum_rise += dz
+    return 0.1 * sum_dist + 1.8 * sum_rise + time * 0.0583
+
+
+@njit(cache=True, nogil=True, fastmath=FASTMATH, error_model="numpy")
+def ihc_nb(points, time):
+    """I Hate To Climb Equation over raw points."""
+    sum_dist = 0.0
+    sum_climb = 0.0
+    for i in range(points.shape[0] - 1):
+        dx = float(points[i + 1, 0]) - float(points[i, 0])
+        dy = float(points[i + 1, 1]) - float(points[i, 1])
+        dz = float(points[i + 1, 2]) - float(points[i, 2])
+        sum_dist += math.sqrt(dx * dx + dy * dy + dz * dz)
+        if dz > 0:
+            sum_climb += dz
+    return sum_climb + sum_dist / 300
+
+
+# Batch kernels: score a stack of candidate paths, cands of shape (k, n, 3),
+# in one call. Used by perturbers that sample many candidates at once.
+
+@njit(cache=True)
+def re3_batch_nb(cands, time):
+    out = np.empty(cands.shape[0])
+    for k in range(cands.shape[0]):
+        out[k] = re3_nb(cands[k], time)
+    return out
+
+
+@njit(cache=True)
+def acsm_batch_nb(cands, time):
+    out = np.empty(cands.shape[0])
+    for k in range(cands.shape[0]):
+        out[k] = acsm_nb(cands[k], time)
+    return out
+
+
+@njit(cache=True)
+def ihc_batch_nb(cands, time):
+    out = np.empty(cands.shape[0])
+    for k in range(cands.shape[0]):
+        out[k] = ihc_nb(cands[k], time)
+    return out
+
+
+# Span kernels: the per-segment part of each cost summed over segments
+# lo..hi-1 (segment i joins points i and i+1). The remaining terms only depend
+# on the time and the segment count, so for two paths with the same point count
+# the cost difference is the difference of their spans over the segments that changed.
+
+@njit(cache=True, fastmath=FASTMATH, error_model="numpy")
+def re3_span_nb(points, lo, hi, time):
+    """Per-segment RE3 terms over segments lo..hi-1."""
+    segCount = points.shape[0] - 1
+    if segCount <= 0:
+        return 0.0
+    segTime = time * 3600.0 / segCount
+    if segTime == 0.0:
+        segTime = 1e-9
+    inv_segTime = 1.0 / segTime
+
+    total = 0.0
+    for i in range(lo, hi):
+        dx = float(points[i + 1, 0]) - float(points[i, 0])
+        dy = float(points[i + 1, 1]) - float(points[i, 1])
+        rise = float(points[i + 1, 2]) - float(points[i, 2])
+        dist2 = dx * dx + dy * dy + rise * rise
+        dist = math.sqrt(dist2)
+        inner = math.exp(LOG_1056 * (rise / dist + 0.43))
+        total += (1.39 * dist + 0.185 * inv_segTime * dist2
+                  + 30.43 * rise * (1.0 - math.exp(LOG_1133 * (1.0 - inner))))
+    return total
+
+
+@njit(cache=True, fastmath=FASTMATH, error_model="numpy")
+def acsm_span_nb(points, lo, hi, time):
+    """Per-segment ACSM terms over segments lo..hi-1."""
+    total = 0.0
+    for i in range(lo, hi):
+        dx = float(points[i + 1, 0]) - float(points[i, 0])
+        dy = float(points[i + 1, 1]) - float(points[i, 1])
+        dz = float(points[i + 1, 2]) - float(points[i, 2])
+        total += 0.1 * math.sqrt(dx * dx + dy * dy + dz * dz) + 1.8 * dz
+    return total
+
+
+@njit(cache=True, fastmath=FASTMATH, error_model="numpy")
+def ihc_span_nb(points, lo, hi, time):
+    """Per-segment I Hate To Climb terms over segments lo..hi-1."""
+    total = 0.0
+    for i in range(lo, hi):
+        dx = float(points[i + 1, 0]) - float(points[i, 0])
+        dy = float(points[i + 1, 1]) - float(points[i, 1])
+        dz = float(points[i + 1, 2]) - float(points[i, 2])
+        total += math.sqrt(dx * dx + dy * dy + dz * dz) / 300
+        if dz > 0:
+            total += dz
+    return total
+
+
+def make_delta(span):
+    """
+    Build the `delta` attribute for a cost function from its span kernel.
+
+    The returned delta(old_path, new_path, index, old_total, time) gives the
+    cost of `new_path` from the cost `old_total` of `old_path`, assuming the
+    two have the same point count and differ only in point `index`. Only the
+    (at most two) segments touching that point are evaluated.
+    """
+    def delta(old_path, new_path, index, old_total, time):
+        n = new_path.get_point_count()
+        lo = max(index - 1, 0)
+        hi = min(index + 1, n - 1)
+        return (old_total
+                + span(new_path.get_points(), lo, hi, time)
+                - span(old_path.get_points(), lo, hi, time))
+    return delta
@@ -1,25 +1,113 @@
 import rasterio
 from rasterio.windows import Window
+from collections import OrderedDict
+import threading
 import numpy as np
 
+_setattr = object.__setattr__
+
+def _fast_window(col_off, row_off, width, height):
+    """
+    Build a Window without running its attrs validators.
+    Only for offsets/lengths already clamped to the dataset bounds.
+    """
+    win = object.__new__(Window)  # Window is frozen/slotted, so set fields via object
+    _setattr(win, "col_off", col_off)
+    _setattr(win, "row_off", row_off)
+    _setattr(win, "width", width)
+    _setattr(win, "height", height)
+    return win
+
 class DEM:
-    def __init__(self, filepath):
+    def __init__(self, filepath, max_resident_bytes=512 * 1024 * 1024, max_cached_blocks=64):
         self.filepath = filepath
         self.dataset = rasterio.open(filepath)
         self.height = self.dataset.height
         self.width = self.dataset.width
+        # Band 1 held in memory so elevation lookups are plain array indexing
+        # instead of one GDAL read per pixel. DEMs larger than max_resident_bytes
+        # are instead read one GeoTIFF block at a time, keeping the most recently
+        # used max_cached_blocks blocks
+        nbytes = self.width * self.height * np.dtype(self.dataset.dtypes[0]).itemsize
+        self._arr = self.dataset.read(1) if nbytes <= max_resident_bytes else None
+        self._block_h, self._block_w = self.dataset.block_shapes[0]
+        self._blocks = OrderedDict()
+        self.max_cached_blocks = max_cached_blocks
+        # rasterio datasets are not thread-safe; serializes reads (and the block
+        # LRU) when tiles are prefetched from a background thread
+        self._read_lock = threading.Lock()
 
-    def get_window(self, x0, y0, x1, y1):
+    def get_array(self):
+        """Band 1 as the resident (height, width) array, or None if the DEM is read block by block."""
+        return self._arr
+
+    def get_window(self, x0, y0, x1, y1, out_shape=None):
+        """
+        Read band 1 over pixels [x0, x1) x [y0, y1), clipped to the DEM.
+        `out_shape` (rows, cols) requests a decimated read, which GDAL serves
+        from the file's overviews when it has them.
+        """
         x0 = max(0, min(x0, self.width))
         x1 = max(0, min(x1, self.width))
         y0 = max(0, min(y0, self.height))
         y1 = max(0, min(y1, self.height))
         if x0 >= x1 or y0 >= y1:
             return None
-        data = self.dataset.read(1, window=Window(x0, y0, x1-x0, y1-y0))
+        with self._read_lock:
+            data = self.dataset.read(1, window=_fast_window(x0, y0, x1-x0, y1-y0), out_shape=out_shape)
         return None if data.size == 0 else data
 
+    def _block(self, bx, by):
+        """Band 1 data of GeoTIFF block (bx, by), read on first use and kept in an LRU."""
+        key = (bx, by)
+        with self._read_lock:
+            block = self._blocks.get(key)
+            if block is not None:
+                self._blocks.move_to_end(key)
+                return block
+            x0 = bx * self._block_w
+            y0 = by * self._block_h
+            block = self.dataset.read(1, window=_fast_window(
+                x0, y0, min(self._block_w, self.width - x0), min(self._block_h, self.height - y0)))
+            self._blocks[key] = block
+            if len(self._blocks) > self.max_cached_blocks:
+                self._blocks.popitem(last=False)
+            return block
+
     def get_elevation(self, x, y):
         if x < 0 or x >= self.width or y < 0 or y >= self.height:
             return None
-        return self.dataset.read(1, window=Window(x, y, 1, 1))[0,0]
+        if self._arr is None:
+            return self._block(x // self._block_w, y // self._block_h)[y % self._block_h, x % self._block_w]
+        return self._arr[y, x]
+
+    def get_elevations_vec(self, xs, ys, fill=np.nan):
+        """
+        Look up elevations for many pixels at once.
+
+        Args:
+            xs, ys: Arrays of pixel coordinates (truncated to integers like int())
+            fill: Value (or array broadcastable to xs) used where a pixel is outside the DEM
+
+        Returns:
+            Float array of elevations with the same shape as xs
+        """
+        xs = np.asarray(xs).astype(np.intp)
+        ys = np.asarray(ys).astype(np.intp)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        xs = np.clip(xs, 0, self.width - 1)
+        ys = np.clip(ys, 0, self.height - 1)
+        if self._arr is not None:
+            z = self._arr[ys, xs]
+        else:
+            # Fetch each touched block once and gather its pixels
+            z = np.empty(xs.shape, dtype=self.dataset.dtypes[0])
+            bxs = xs // self._block_w
+            bys = ys // self._block_h
+            keys = bys * (self.width // self._block_w + 1) + bxs
+            for key in np.unique(keys):
+                sel = keys == key
+                bx = int(bxs[sel].flat[0])
+                by = int(bys[sel].flat[0])
+                z[sel] = self._block(bx, by)[ys[sel] % self._block_h, xs[sel] % self._block_w]
+        return np.where(inside, z, fill)
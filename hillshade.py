@@ -1,11 +1,18 @@
+import math
+from functools import lru_cache
 import numpy as np
 
+@lru_cache(maxsize=8)
+def _sun_trig(azimuth, altitude):
+    """(sin(alt), cos(alt), az) in radians for a light direction given in degrees."""
+    # float64 scalars, as np.radians returned, so float32 tiles still shade in float64
+    alt = math.radians(altitude)
+    return np.float64(math.sin(alt)), np.float64(math.cos(alt)), np.float64(math.radians(azimuth))
+
 def hillshade(array, azimuth=315, altitude=45):
+    sin_alt, cos_alt, az = _sun_trig(azimuth, altitude)
     x, y = np.gradient(array)
     slope = np.pi/2 - np.arctan(np.sqrt(x*x + y*y))
     aspect = np.arctan2(-x, y)
-    az = np.radians(azimuth)
-    alt = np.radians(altitude)
-    shaded = np.sin(alt) * np.sin(slope) + np.cos(alt) * np.cos(slope) * np.cos(az - aspect)
+    shaded = sin_alt * np.sin(slope) + cos_alt * np.cos(slope) * np.cos(az - aspect)
     return np.clip(shaded, 0, 1)
-
@@ -0,0 +1,41 @@
+"""
+Numba kernel for hillshade.hillshade that writes display-ready uint8 shading.
+
+With gx, gy the np.gradient components along rows and columns and
+g = sqrt(gx^2 + gy^2), the slope/aspect terms of hillshade() reduce to
+
+    sin(slope) = 1 / sqrt(1 + g^2)
+    cos(slope) * cos(az - aspect) = (cos(az) * gy - sin(az) * gx) / sqrt(1 + g^2)
+
+so each pixel costs one sqrt and no atan/atan2/cos calls.
+"""
+import math
+from numba_compat import njit, prange, FASTMATH
+
+
+@njit(parallel=True, fastmath=FASTMATH, cache=True)
+def hillshade_u8(arr, az_rad, alt_rad, out):
+    """Shade `arr` into the uint8 array `out` (same shape) as clip(hillshade, 0, 1) * 255."""
+    h, w = arr.shape
+    sin_alt = math.sin(alt_rad)
+    cos_alt = math.cos(alt_rad)
+    sin_az = math.sin(az_rad)
+    cos_az = math.cos(az_rad)
+    for i in prange(h):
+        # np.gradient: central differences inside, one-sided at the edges
+        i0 = max(i - 1, 0)
+        i1 = min(i + 1, h - 1)
+        si = 1.0 / (i1 - i0) if i1 > i0 else 0.0
+        for j in range(w):
+            j0 = max(j - 1, 0)
+            j1 = min(j + 1, w - 1)
+            sj = 1.0 / (j1 - j0) if j1 > j0 else 0.0
+            gx = (float(arr[i1, j]) - float(arr[i0, j])) * si
+            gy = (float(arr[i, j1]) - float(arr[i, j0])) * sj
+            inv_n = 1.0 / math.sqrt(1.0 + gx * gx + gy * gy)
+            shaded = (sin_alt + cos_alt * (cos_az * gy - sin_az * gx)) * inv_n
+            if not shaded > 0.0:  # also maps NaN to 0
+                shaded = 0.0
+            elif shaded > 1.0:
+                shaded = 1.0
+            out[i, j] = int(shaded * 255.0)
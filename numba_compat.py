@@ -0,0 +1,45 @@
+"""Optional Numba support.
+
+Numba is not required to run ScrambleOpt. Modules that provide JIT kernels
+import `njit`/`prange` from here and check `NUMBA_AVAILABLE` before choosing
+the compiled path over their NumPy implementation.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit so kernel modules still import."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# fastmath flags that keep NaN/Inf semantics intact (so a zero-length segment
+# still yields NaN like the NumPy implementations do)
+FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+class StopFlag:
+    """threading.Event stand-in whose state is a 1-element uint8 array.
+
+    Python code uses set()/clear()/is_set() as on an Event; compiled loops are
+    handed `flag` and poll flag[0] every iteration, a single memory load,
+    instead of returning to Python to call is_set().
+    """
+
+    def __init__(self):
+        self.flag = np.zeros(1, dtype=np.uint8)
+
+    def set(self):
+        self.flag[0] = 1
+
+    def clear(self):
+        self.flag[0] = 0
+
+    def is_set(self):
+        return bool(self.flag[0])
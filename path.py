@@ -1,40 +1,145 @@
-import math
+import itertools
 import numpy as np
 from typing import List, Tuple, Optional
 
+# Process-wide source of content stamps for xyzPath._version
+_VERSIONS = itertools.count()
+
 class xyzPath:
     """
     Stores and manages a path as a series of points in 3D raster space (x, y, z).
     Points are stored in raster coordinates with z values read from a DEM.
+
+    Points live in one contiguous float32 buffer of shape (capacity, 3) that
+    grows by doubling; only the first `_n` rows are in use. `points` exposes
+    those rows as a view.
+
+    `_version` stamps the current contents: every mutator takes a fresh,
+    process-wide unique value, while copies and swaps carry it along, so two
+    paths with the same `_version` hold the same points.
     """
+    _MIN_CAPACITY = 16
+
     def __init__(self, dem=None):
         """
         Initialize an empty path.
+        
         Args:
             dem: DEM object for reading height values (optional, can be set later)
         """
         self.dem = dem
-        self.points = []  # List of [x, y, z] coordinates
+        self._pts = np.empty((self._MIN_CAPACITY, 3), dtype=np.float32)  # rows of [x, y, z]
+        self._n = 0
+        self._seg_cache = None  # get_segments() result, cleared by every mutator
+        self._version = next(_VERSIONS)
+        self._seg_scratch = None  # (m, 4) float32 buffer get_segments() writes into
         self.locked = False  # When locked, start/end points cannot be modified
 
+    @property
+    def points(self) -> np.ndarray:
+        """
+        (n, 3) float32 read-only view of the points in use, columns [x, y, z].
+        
+        Modify points through the path's methods (or by assigning `points`)
+        so cached segment data and `_version` are updated.
+        """
+        view = self._pts[:self._n]
+        view.flags.writeable = False
+        return view
+
+    @points.setter
+    def points(self, value) -> None:
+        """Replace all points with an (n, 3) array-like of [x, y, z] rows."""
+        arr = np.asarray(value, dtype=np.float32).reshape(-1, 3)
+        n = len(arr)
+        self._pts = np.empty((max(n, self._MIN_CAPACITY), 3), dtype=np.float32)
+        self._pts[:n] = arr
+        self._n = n
+        self._seg_cache = None
+        self._version = next(_VERSIONS)
+
+    def assign_points(self, arr) -> None:
+        """
+        Overwrite this path's points with the (n, 3) rows of `arr`, reusing the
+        existing buffer when it is large enough (unlike assigning `points`,
+        which always allocates). Views from earlier get_points() calls see the new rows.
+        """
+        arr = np.asarray(arr, dtype=np.float32).reshape(-1, 3)
+        n = len(arr)
+        self._n = 0  # nothing to preserve if the buffer has to grow
+        self._reserve(n)
+        self._pts[:n] = arr
+        self._n = n
+        self._seg_cache = None
+        self._version = next(_VERSIONS)
+
+    def adopt_points(self, arr: np.ndarray) -> None:
+        """
+        Use the writeable C-contiguous (n, 3) float32 array `arr` as the point
+        buffer without copying; the caller must not touch `arr` afterwards.
+        Other arrays (e.g. another path's read-only view) are copied as by
+        assigning `points`.
+        """
+        if (arr.dtype != np.float32 or arr.ndim != 2 or arr.shape[1] != 3
+                or not arr.flags.c_contiguous or not arr.flags.writeable):
+            self.points = arr
+            return
+        self._pts = arr
+        self._n = len(arr)
+        self._seg_cache = None
+        self._version = next(_VERSIONS)
+
+    def _reserve(self, capacity: int) -> None:
+        """Grow the point buffer (by doubling) so it holds at least `capacity` rows."""
+        if capacity <= len(self._pts):
+            return
+        new_cap = max(capacity, 2 * len(self._pts))
+        buf = np.empty((new_cap, 3), dtype=np.float32)
+        buf[:self._n] = self._pts[:self._n]
+        self._pts = buf
+
     def shallow_copy(self):
         """Return a shallow copy of the path (copies points and locked state, references DEM)."""
         new_path = xyzPath(self.dem)
-        new_path.points = [pt.copy() for pt in self.points]
+        new_path._pts = self._pts[:self._n].copy()
+        new_path._n = self._n
+        if self._seg_cache is not None:
+            new_path._seg_cache = self._seg_cache.copy()
+            new_path._seg_cache.flags.writeable = False
         new_path.locked = self.locked
+        new_path._version = self._version
         return new_path
-
     
-    def __init__(self, dem=None):
+    def copy_from(self, other) -> None:
         """
-        Initialize an empty path.
-        
-        Args:
-            dem: DEM object for reading height values (optional, can be set later)
+        Overwrite this path with `other`'s points, locked state and DEM,
+        reusing this path's buffer instead of allocating a new path.
         """
-        self.dem = dem
-        self.points = []  # List of [x, y, z] coordinates
-        self.locked = False  # When locked, start/end points cannot be modified
+        n = other._n
+        self._n = 0  # nothing to preserve if the buffer has to grow
+        self._reserve(n)
+        self._pts[:n] = other._pts[:n]
+        self._n = n
+        self._seg_cache = None if other._seg_cache is None else other._seg_cache.copy()
+        if self._seg_cache is not None:
+            self._seg_cache.flags.writeable = False
+        self.locked = other.locked
+        self.dem = other.dem
+        self._version = other._version
+    
+    def take_ownership(self, other) -> None:
+        """
+        Swap contents with `other` in O(1): this path takes over `other`'s
+        buffers and state, and `other` is left holding this path's old ones.
+        """
+        self._pts, other._pts = other._pts, self._pts
+        self._n, other._n = other._n, self._n
+        # the cache is a view of the scratch buffer, so they move together
+        self._seg_cache, other._seg_cache = other._seg_cache, self._seg_cache
+        self._seg_scratch, other._seg_scratch = other._seg_scratch, self._seg_scratch
+        self.locked, other.locked = other.locked, self.locked
+        self.dem, other.dem = other.dem, self.dem
+        self._version, other._version = other._version, self._version
     
     def set_dem(self, dem):
         """Set or update the DEM reference."""
@@ -56,7 +161,11 @@ class xyzPath:
             if z is None:
                 raise ValueError(f"Could not read elevation at ({x}, {y})")
         
-        self.points.append([float(x), float(y), float(z)])
+        self._reserve(self._n + 1)
+        self._pts[self._n] = (float(x), float(y), float(z))
+        self._n += 1
+        self._seg_cache = None
+        self._version = next(_VERSIONS)
     
     def delete_point(self, index: int) -> None:
         """
@@ -68,11 +177,15 @@ class xyzPath:
         Raises:
             IndexError: If index is out of range or if trying to delete protected points while locked
         """
-        if index < 0 or index >= len(self.points):
-            raise IndexError(f"Point index {index} out of range [0, {len(self.points)-1}]")
-        if self.locked and (index == 0 or index == len(self.points) - 1):
+        n = self._n
+        if index < 0 or index >= n:
+            raise IndexError(f"Point index {index} out of range [0, {n-1}]")
+        if self.locked and (index == 0 or index == n - 1):
             raise IndexError(f"Cannot delete start or end point when path is locked (index {index})")
-        self.points.pop(index)
+        self._pts[index:n - 1] = self._pts[index + 1:n]
+        self._n = n - 1
+        self._seg_cache = None
+        self._version = next(_VERSIONS)
     
     def shift_point(self, index: int, dx: float, dy: float, update_z: bool = True) -> None:
         """
@@ -87,13 +200,15 @@ class xyzPath:
         Raises:
             IndexError: If index is out of range or if trying to shift protected points while locked
         """
-        if index < 0 or index >= len(self.points):
-            raise IndexError(f"Point index {index} out of range [0, {len(self.points)-1}]")
-        if self.locked and (index == 0 or index == len(self.points) - 1):
+        n = self._n
+        if index < 0 or index >= n:
+            raise IndexError(f"Point index {index} out of range [0, {n-1}]")
+        if self.locked and (index == 0 or index == n - 1):
             raise IndexError(f"Cannot shift start or end point when path is locked (index {index})")
         
-        new_x = self.points[index][0] + dx
-        new_y = self.points[index][1] + dy
+        point = self._pts[index]
+        new_x = float(point[0]) + dx
+        new_y = float(point[1]) + dy
         
         if update_z:
             if self.dem is None:
@@ -101,14 +216,99 @@ class xyzPath:
             z = self.dem.get_elevation(int(new_x), int(new_y))
             if z is None:
                 raise ValueError(f"Could not read elevation at ({new_x}, {new_y})")
-            self.points[index] = [new_x, new_y, z]
+            point[:] = (new_x, new_y, z)
         else:
-            self.points[index][0] = new_x
-            self.points[index][1] = new_y
+            point[0] = new_x
+            point[1] = new_y
+        self._refresh_segments(np.array([index - 1, index]))
+        self._version = next(_VERSIONS)
     
-    def update_z_values(self) -> None:
+    def shift_points(self, indices, dx: float, dy: float, update_z: bool = True) -> None:
         """
-        Update all z values by reading from the DEM at each point's x, y location.
+        Shift several points by the same deltas, as shift_point() does for one,
+        with the x/y update and DEM lookup vectorized over all of them. Every
+        index and new elevation is checked first: either all points move or none do.
+        
+        Args:
+            indices: Distinct indices of the points to shift
+            dx: Change in x coordinate
+            dy: Change in y coordinate
+            update_z: If True, read new z values from DEM at the new positions
+            
+        Raises:
+            IndexError: If an index is out of range or is a protected point while locked
+            ValueError: If update_z is set without a DEM, or a new position has no elevation
+        """
+        idx = np.asarray(indices, dtype=np.intp).reshape(-1)
+        if len(idx) == 1:
+            # plain scalar path for the common single-point drag
+            self.shift_point(int(idx[0]), dx, dy, update_z=update_z)
+            return
+        if len(idx) == 0:
+            return
+        n = self._n
+        bad = idx[(idx < 0) | (idx >= n)]
+        if len(bad):
+            raise IndexError(f"Point index {int(bad[0])} out of range [0, {n-1}]")
+        if self.locked:
+            bad = idx[(idx == 0) | (idx == n - 1)]
+            if len(bad):
+                raise IndexError(f"Cannot shift start or end point when path is locked (index {int(bad[0])})")
+        
+        pts = self._pts
+        # summed in float64 and rounded to float32 once, like shift_point()
+        new_x = pts[idx, 0].astype(np.float64) + dx
+        new_y = pts[idx, 1].astype(np.float64) + dy
+        
+        if update_z:
+            if self.dem is None:
+                raise ValueError("Cannot update z value: no DEM set")
+            if hasattr(self.dem, "get_elevations_vec"):
+                # the pixel get_elevation(int(x), int(y)) would read, for all points at once
+                xi = new_x.astype(np.intp)
+                yi = new_y.astype(np.intp)
+                outside = np.flatnonzero((xi < 0) | (xi >= self.dem.width) | (yi < 0) | (yi >= self.dem.height))
+                if len(outside):
+                    j = outside[0]
+                    raise ValueError(f"Could not read elevation at ({new_x[j]}, {new_y[j]})")
+                z = self.dem.get_elevations_vec(new_x, new_y)
+            else:
+                z = []
+                for x, y in zip(new_x.tolist(), new_y.tolist()):
+                    e = self.dem.get_elevation(int(x), int(y))
+                    if e is None:
+                        raise ValueError(f"Could not read elevation at ({x}, {y})")
+                    z.append(e)
+            pts[idx, 2] = z
+        pts[idx, 0] = new_x
+        pts[idx, 1] = new_y
+        self._refresh_segments(np.concatenate((idx - 1, idx)))
+        self._version = next(_VERSIONS)
+    
+    def _refresh_segments(self, rows: np.ndarray) -> None:
+        """
+        Recompute just the cached get_segments() rows `rows` (segment i joins
+        points i and i+1) after the points they touch moved, with the same
+        arithmetic as a full recompute. Rows outside [0, n-2] are ignored;
+        nothing is done if no segments are cached.
+        """
+        seg = self._seg_cache
+        if seg is None:
+            return
+        rows = rows[(rows >= 0) & (rows < len(seg))]
+        deltas = self._pts[rows + 1] - self._pts[rows]  # [dx, dy, dz]
+        seg.flags.writeable = True
+        seg[rows, :3] = deltas
+        seg[rows, 3] = np.sqrt(np.einsum('ij,ij->i', deltas, deltas))
+        seg.flags.writeable = False
+    
+    def update_z_values(self, indices=None) -> None:
+        """
+        Update z values by reading from the DEM at each point's x, y location.
+        
+        Args:
+            indices: Optional iterable of point indices to update (e.g. just the
+                points a move touched); all points are updated if None
         
         Raises:
             ValueError: If no DEM is set
@@ -116,50 +316,85 @@ class xyzPath:
         if self.dem is None:
             raise ValueError("Cannot update z values: no DEM set")
         
-        for point in self.points:
-            z = self.dem.get_elevation(int(point[0]), int(point[1]))
-            if z is not None:
-                point[2] = z
+        pts = self._pts[:self._n]
+        if indices is not None:
+            for i in indices:
+                point = pts[i]
+                z = self.dem.get_elevation(int(point[0]), int(point[1]))
+                if z is not None:
+                    point[2] = z
+        elif hasattr(self.dem, "get_elevations_vec"):
+            # Points outside the DEM keep their current z
+            pts[:, 2] = self.dem.get_elevations_vec(pts[:, 0], pts[:, 1], fill=pts[:, 2])
+        else:
+            # one bulk conversion instead of two NumPy-scalar int() calls per point
+            for i, (x, y) in enumerate(pts[:, :2].astype(int).tolist()):
+                z = self.dem.get_elevation(x, y)
+                if z is not None:
+                    pts[i, 2] = z
+        self._seg_cache = None
+        self._version = next(_VERSIONS)
     
     def get_points(self) -> np.ndarray:
         """
         Return all points as a numpy array of shape (n, 3) with columns [x, y, z].
         
+        The array is a read-only view of the path's buffer, not a copy; copy
+        it before modifying it or keeping it across mutations of the path.
+        
         Returns:
-            Nx3 numpy array of points, or empty array if no points
+            Nx3 float32 numpy array of points, or empty array if no points
         """
-        if not self.points:
-            return np.array([]).reshape(0, 3)
-        return np.array(self.points, dtype=np.float32)
+        view = self._pts[:self._n]
+        view.flags.writeable = False
+        return view
     
     def get_segments(self) -> np.ndarray:
         """
         Compute and return segment information between consecutive points.
         Each row contains [dx, dy, dz, distance] for each segment.
         
+        The result is cached until the path is next modified and is returned
+        read-only; copy it if you need to change it. It is a view of a buffer
+        that is overwritten the next time segments are computed after a
+        modification, so copy it before keeping it across modifications.
+        Moving points (shift_point(), shift_points()) updates only the cached
+        rows of the segments they touch instead of dropping the cache.
+        
         Returns:
             (n-1)x4 numpy array where n is the number of points,
             or empty array if fewer than 2 points
         """
-        if len(self.points) < 2:
-            return np.array([]).reshape(0, 4)
+        if self._seg_cache is not None:
+            return self._seg_cache
+        if self._n < 2:
+            return np.array([], dtype=np.float32).reshape(0, 4)
         
-        points = np.array(self.points, dtype=np.float32)
-        deltas = np.diff(points, axis=0)  # [dx, dy, dz]
+        n = self._n
+        if self._seg_scratch is None or len(self._seg_scratch) < n - 1:
+            self._seg_scratch = np.empty((len(self._pts), 4), dtype=np.float32)
+        segments = self._seg_scratch[:n - 1]
+        deltas = segments[:, :3]
+        np.subtract(self._pts[1:n], self._pts[:n - 1], out=deltas)  # [dx, dy, dz]
         
         # Calculate 3D distance for each segment
-        distances = np.linalg.norm(deltas, axis=1, keepdims=True)
+        dist = segments[:, 3]
+        np.einsum('ij,ij->i', deltas, deltas, out=dist)
+        np.sqrt(dist, out=dist)
         
-        segments = np.hstack([deltas, distances])
+        segments.flags.writeable = False
+        self._seg_cache = segments
         return segments
     
     def get_point_count(self) -> int:
         """Return the number of points in the path."""
-        return len(self.points)
+        return self._n
     
     def clear(self) -> None:
         """Clear all points from the path."""
-        self.points = []
+        self._n = 0
+        self._seg_cache = None
+        self._version = next(_VERSIONS)
     
     def get_point(self, index: int) -> List[float]:
         """
@@ -174,9 +409,9 @@ class xyzPath:
         Raises:
             IndexError: If index is out of range
         """
-        if index < 0 or index >= len(self.points):
-            raise IndexError(f"Point index {index} out of range [0, {len(self.points)-1}]")
-        return self.points[index].copy()
+        if index < 0 or index >= self._n:
+            raise IndexError(f"Point index {index} out of range [0, {self._n-1}]")
+        return self._pts[index].tolist()
     
     def get_total_distance(self) -> float:
         """
@@ -217,9 +452,9 @@ class xyzPath:
         Returns:
             True if the point is the first or last point, False otherwise
         """
-        if len(self.points) == 0:
+        if self._n == 0:
             return False
-        return index == 0 or index == len(self.points) - 1
+        return index == 0 or index == self._n - 1
 
     def consolidate_consecutive_clusters(self, max_distance: float = 10) -> None:
         """
@@ -235,53 +470,54 @@ class xyzPath:
 
         This modifies the path in place.
         """
-        n = len(self.points)
+        n = self._n
         if n < 2:
             return
 
-        def dist2(a, b):
-            return math.hypot(a[0] - b[0], a[1] - b[1])
+        pts = self._pts[:n].astype(np.float64)
 
-        new_pts = []
-        i = 0
-        while i < n:
-            # if next point is close, start collecting a run
-            if i < n - 1 and dist2(self.points[i], self.points[i + 1]) <= max_distance:
-                run_indices = [i]
-                j = i
-                while j < n - 1 and dist2(self.points[j], self.points[j + 1]) <= max_distance:
-                    j += 1
-                    run_indices.append(j)
+        # Split the path into maximal runs of consecutive close points
+        # (squared distances, so no sqrt; a negative max_distance matches nothing)
+        dx = np.diff(pts[:, 0])
+        dy = np.diff(pts[:, 1])
+        close = dx * dx + dy * dy <= max_distance * max_distance
+        if max_distance < 0:
+            close[:] = False
+        starts = np.flatnonzero(np.r_[True, ~close])
+        counts = np.diff(np.r_[starts, n])
 
-                # If locked and run includes protected endpoints, skip collapsing
-                if self.locked and (0 in run_indices or (n - 1) in run_indices):
-                    for k in run_indices:
-                        new_pts.append(self.points[k].copy())
-                    i = j + 1
-                    continue
+        # Runs of 2+ points collapse, unless locked and touching an endpoint
+        collapse = counts > 1
+        if self.locked:
+            collapse &= (starts != 0) & (starts + counts != n)
+        if not collapse.any():
+            return
 
-                # Compute mean x,y and determine z
-                xs = [self.points[k][0] for k in run_indices]
-                ys = [self.points[k][1] for k in run_indices]
-                mean_x = float(np.mean(xs))
-                mean_y = float(np.mean(ys))
-                if self.dem is not None:
-                    try:
-                        z = self.dem.get_elevation(int(mean_x), int(mean_y))
-                        if z is None:
-                            zs = [self.points[k][2] for k in run_indices]
-                            z = float(np.mean(zs))
-                    except Exception:
-                        zs = [self.points[k][2] for k in run_indices]
-                        z = float(np.mean(zs))
-                else:
-                    zs = [self.points[k][2] for k in run_indices]
-                    z = float(np.mean(zs))
+        means = np.add.reduceat(pts, starts, axis=0)[collapse] / counts[collapse, None]
+        if self.dem is not None:
+            means[:, 2] = self._cluster_elevations(means)
 
-                new_pts.append([mean_x, mean_y, z])
-                i = j + 1
-            else:
-                new_pts.append(self.points[i].copy())
-                i += 1
+        # Each collapsed run is replaced by its first point, moved to the mean
+        pts[starts[collapse]] = means
+        is_first = np.zeros(n, dtype=bool)
+        is_first[starts] = True
+        keep = is_first | ~np.repeat(collapse, counts)
+
+        self.points = pts[keep]
 
-        self.points = new_pts
+    def _cluster_elevations(self, means: np.ndarray) -> np.ndarray:
+        """DEM z at each cluster's mean x/y, keeping the mean z where the DEM has no value."""
+        zs = means[:, 2].copy()
+        if hasattr(self.dem, "get_elevations_vec"):
+            try:
+                return self.dem.get_elevations_vec(means[:, 0], means[:, 1], fill=zs)
+            except Exception:
+                return zs
+        for k, (x, y) in enumerate(means[:, :2].astype(int).tolist()):
+            try:
+                z = self.dem.get_elevation(x, y)
+            except Exception:
+                z = None
+            if z is not None:
+                zs[k] = z
+        return zs
@@ -1,9 +1,81 @@
-import math
-import random
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+from numba_compat import NUMBA_AVAILABLE
+from perturbers.singlePointMover_nb import build_candidate_nb, build_propagated_nb
 
 name = "Relocate Point Mover"
 
+# Shared by all movers so the worker threads are started once per process
+_POOL = None
+
+
+def _pool():
+    global _POOL
+    if _POOL is None:
+        _POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+    return _POOL
+
+
+# Cost by xyzPath._version, shared by all movers: an O(1) lookup that catches
+# the real repeats (the solver's scratch copy of an accepted path carries its
+# stamp, so each perturb() call's baseline is usually a hit).
+# Holds costs for one cost function at a time
+_STAMP_COSTS = OrderedDict()
+_STAMP_COSTS_MAX = 4096
+_stamp_cost_function = None
+
+
+def _stamp_costs(cost_function):
+    """The shared stamp -> cost LRU, emptied when the cost function changes."""
+    global _stamp_cost_function
+    if cost_function is not _stamp_cost_function:
+        _STAMP_COSTS.clear()
+        _stamp_cost_function = cost_function
+    return _STAMP_COSTS
+
+
+def _cached_cost(cost_function, path):
+    """Cost recorded for `path`'s current contents stamp, or None."""
+    version = getattr(path, '_version', None)
+    if version is None:
+        return None
+    costs = _stamp_costs(cost_function)
+    c = costs.get(version)
+    if c is not None:
+        costs.move_to_end(version)
+    return c
+
+
+def _remember_stamp(cost_function, path, c):
+    version = getattr(path, '_version', None)
+    if version is None:
+        return
+    costs = _stamp_costs(cost_function)
+    costs[version] = c
+    if len(costs) > _STAMP_COSTS_MAX:
+        costs.popitem(last=False)
+
+
+def warmup():
+    """Compile (or load from Numba's cache) the candidate builders on a throwaway 3-point path."""
+    if not NUMBA_AVAILABLE:
+        return
+    pts = np.zeros((3, 3), dtype=np.float32)
+    build_candidate_nb(pts, 1, 0.5, 0.5)
+    build_propagated_nb(pts, 1, 0.5, 0.5, 0.5)
+
+
+def _never():
+    return False
+
+
+def _stop_check(stop_event):
+    """No-argument callable reporting whether `stop_event` is set, resolved once per perturb() call."""
+    is_set = getattr(stop_event, 'is_set', None)
+    return is_set if callable(is_set) else _never
+
 
 class SinglePointMover:
     """Relocate a single interior point by local sampling and hill-climb.
@@ -12,7 +84,8 @@ class SinglePointMover:
     1. Pick a random interior vertex.
     2. Sample a set of candidate offsets in a circular neighborhood.
     3. Evaluate candidate paths and pick the best.
-    4. Optionally perform a small local hill-climb around the best candidate.
+    4. Optionally perform a small local hill-climb around the best candidate
+       (first-improvement by default).
 
     This perturber does NOT perform any automatic resegmenting or simplification;
     keep manual resegmenting via the UI if desired.
@@ -20,15 +93,35 @@ class SinglePointMover:
     acceptance to the outer optimization routine.
     """
 
-    def __init__(self, spacing=10.0, samples=16, max_climb_steps=6):
+    def __init__(self, spacing=10.0, samples=16, max_climb_steps=6, seed=None,
+                 parallel=True, parallel_min_points=1000, first_improvement=True, verbose=False):
         self.spacing = spacing
         self.samples = samples
         self.max_climb_steps = max_climb_steps
+        # score coarse samples concurrently on the shared thread pool; only worth
+        # the dispatch overhead when each cost evaluation is substantial
+        self.parallel = parallel
+        self.parallel_min_points = parallel_min_points
+        # hill-climb moves on at the first improving neighbour instead of
+        # scoring the whole neighbourhood (coarse sampling always scores all)
+        self.first_improvement = first_improvement
+        # if True, print every improvement found while perturbing
+        self.verbose = verbose
+        # all random draws come from this generator, in vectorized batches
+        self._rng = np.random.default_rng(seed)
         # propagation state: dict or None
         # {'center': idx, 'dx': dx, 'dy': dy, 'neighbor_frac': 0.5, 'steps_remaining': n}
         self._propagation = None
         # record last tentative move (idx, dx, dy) produced by perturb
         self._last_move = None
+        # index of the only point the last returned path moved, or None if it
+        # moved several points or none; lets the solver price the move incrementally
+        self.changed_index = None
+        # reused across perturb() calls: the path sequential and hill-climb
+        # candidates are scored in (only winners are copied out of it) and the
+        # (samples, n, 3) stack for batched scoring
+        self._scratch = None
+        self._batch_buf = None
 
     def _movement_radius(self, path):
         segments = path.get_segments()
@@ -38,27 +131,114 @@ class SinglePointMover:
         return max(1.0, 0.25 * avg_seg)
 
     def _make_candidate(self, path_cls, dem, pts, idx, dx, dy):
-        """Build a candidate xyzPath from raw points `pts` (numpy or list).
+        """Build a candidate xyzPath from the (n, 3) points `pts` with point `idx` moved by (dx, dy).
 
-        To avoid repeated `get_points()` calls and many `add_point` calls we
-        construct the points list directly and assign to `new_path.points`.
+        `pts` is the parent's float32 point array, so assigning it to
+        `new_path.points` is a single buffer copy with no dtype conversion (with
+        Numba, the copy and the move are one compiled pass); only the moved
+        point's z is re-read from the DEM, the others keep the parent's z.
         """
-        new_points = []
-        # pts may be numpy array or list-of-lists
-        for i in range(len(pts)):
-            pt = pts[i]
-            if i == idx:
-                new_points.append([float(pt[0]) + dx, float(pt[1]) + dy, float(pt[2])])
-            else:
-                new_points.append([float(pt[0]), float(pt[1]), float(pt[2])])
-
         new_path = path_cls(dem)
-        new_path.points = new_points
-        if new_path and new_path.dem:
-            new_path.update_z_values()
+        if NUMBA_AVAILABLE:
+            new_path.adopt_points(build_candidate_nb(pts, idx, float(dx), float(dy)))
+        else:
+            new_path.points = pts
+            new_path.shift_point(idx, dx, dy, update_z=False)
+        if dem is not None:
+            new_path.update_z_values(indices=(idx,))
         return new_path
 
+    def _fill_candidate(self, cand, pts, idx, dx, dy):
+        """Overwrite the scratch path `cand` with `pts`, point `idx` moved by (dx, dy), as _make_candidate would build it."""
+        cand.assign_points(pts)
+        cand.shift_point(idx, dx, dy, update_z=False)
+        if cand.dem is not None:
+            cand.update_z_values(indices=(idx,))
+        return cand
+
+    def _scratch_path(self, path_cls, dem):
+        scratch = self._scratch
+        if scratch is None or scratch.__class__ is not path_cls:
+            scratch = self._scratch = path_cls(dem)
+        scratch.dem = dem
+        return scratch
+
+    def _cost(self, cost_function, path):
+        """cost_function(path), served from the stamp cache when these contents were scored before."""
+        c = _cached_cost(cost_function, path)
+        if c is None:
+            c = cost_function(path)
+            _remember_stamp(cost_function, path, c)
+        return c
+
+    def _move_cost(self, cost_function, delta_cost, parent, parent_cost, cand, idx):
+        """Cost of `cand`, which equals `parent` except at point `idx`.
+
+        Priced from `parent_cost` by the cost function's delta form (only the
+        two segments at `idx` are re-evaluated) when it has one and
+        `parent_cost` is finite; otherwise, or if the delta call fails, by _cost.
+        """
+        if delta_cost is not None and np.isfinite(parent_cost):
+            try:
+                return delta_cost(parent, cand, idx, parent_cost)
+            except Exception:
+                pass
+        return self._cost(cost_function, cand)
+
+    def _pooled_costs(self, cost_function, cands):
+        """Costs of `cands`, with stamp cache misses evaluated concurrently on the shared pool.
+
+        The cache is only read and written on the calling thread; workers just
+        run cost_function. Failed evaluations give inf and aren't cached,
+        as in the sequential loop.
+        """
+        costs = [_cached_cost(cost_function, cand) for cand in cands]
+        misses = [i for i, c in enumerate(costs) if c is None]
+
+        def evaluate(cand):
+            try:
+                return cost_function(cand), True
+            except Exception:
+                return float('inf'), False
+
+        for i, (c, ok) in zip(misses, _pool().map(evaluate, [cands[i] for i in misses])):
+            costs[i] = c
+            if ok:
+                _remember_stamp(cost_function, cands[i], c)
+        return costs
+
+    def _sample_batch(self, dem, pts, idx, radius, batch_cost):
+        """Score all coarse samples around point `idx` with one batched cost call.
+
+        Candidates are stacked as a (samples, n, 3) float32 array, which is
+        what the candidate paths would store; as in _make_candidate only the
+        moved point's z is looked up on the DEM.
+        Returns (best cost, best candidate's points), or None if the batched
+        call failed and the caller should fall back to scoring one by one.
+        """
+        angles = self._rng.uniform(0, 2 * np.pi, self.samples)
+        r = self._rng.uniform(0, radius, self.samples)
+        shape = (self.samples,) + pts.shape
+        cands = self._batch_buf
+        if cands is None or cands.shape != shape:
+            cands = self._batch_buf = np.empty(shape, dtype=np.float32)
+        cands[:] = pts
+        # moved coordinates are summed in float64 and rounded once, like shift_point()
+        cands[:, idx, 0] = float(pts[idx, 0]) + r * np.cos(angles)
+        cands[:, idx, 1] = float(pts[idx, 1]) + r * np.sin(angles)
+        if dem is not None:
+            cands[:, idx, 2] = dem.get_elevations_vec(cands[:, idx, 0], cands[:, idx, 1], fill=cands[:, idx, 2])
+        try:
+            costs = np.asarray(batch_cost(cands), dtype=np.float64)
+        except Exception:
+            return None
+        costs[np.isnan(costs)] = np.inf  # like the per-candidate loop, NaN never wins
+        k = int(np.argmin(costs))
+        return costs[k], cands[k]
+
     def perturb(self, path, cost_function=None, stop_event=None):
+        self.changed_index = None
+        stopped = _stop_check(stop_event)
         if path.get_point_count() < 3:
             return path
 
@@ -66,12 +246,12 @@ class SinglePointMover:
         n = len(pts)
 
         # pick a random interior point
-        idx = random.randint(1, n - 2)
+        idx = int(self._rng.integers(1, n - 1))
 
         radius = self._movement_radius(path)
 
         # baseline
-        baseline_cost = cost_function(path) if cost_function else float('inf')
+        baseline_cost = self._cost(cost_function, path) if cost_function else float('inf')
         best_path = path
         best_cost = baseline_cost
 
@@ -82,22 +262,21 @@ class SinglePointMover:
             dy = self._propagation['dy']
             frac = self._propagation.get('neighbor_frac', 0.5)
 
-            pts = path.get_points()
-            # build points list directly for candidate
-            new_points = []
-            for i in range(len(pts)):
-                pt = pts[i]
-                if i == center:
-                    new_points.append([float(pt[0]) + dx, float(pt[1]) + dy, float(pt[2])])
-                elif i == center - 1 or i == center + 1:
-                    new_points.append([float(pt[0]) + dx * frac, float(pt[1]) + dy * frac, float(pt[2])])
-                else:
-                    new_points.append([float(pt[0]), float(pt[1]), float(pt[2])])
-
+            # move the center and, by `frac`, its neighbours; indices that no
+            # longer exist (the path may have been resegmented) are skipped
+            moved = [j for j in (center - 1, center, center + 1) if 0 <= j < n]
             new_path = path.__class__(path.dem)
-            new_path.points = new_points
-            if new_path and new_path.dem:
-                new_path.update_z_values()
+            if NUMBA_AVAILABLE:
+                new_path.adopt_points(build_propagated_nb(pts, int(center), float(dx), float(dy), float(frac)))
+            else:
+                arr = np.array(pts, dtype=np.float64)
+                for j in moved:
+                    f = 1.0 if j == center else frac
+                    arr[j, 0] += dx * f
+                    arr[j, 1] += dy * f
+                new_path.points = arr
+            if path.dem is not None:
+                new_path.update_z_values(indices=moved)
 
             # record last move for solver notification
             self._last_move = (center, dx, dy)
@@ -109,92 +288,115 @@ class SinglePointMover:
         # local references to avoid attribute lookups in loop
         path_cls = path.__class__
         dem = path.dem
-        pts = path.get_points()
-        for s in range(self.samples):
-            # quick stop check to reduce latency
-            if stop_event is not None:
-                try:
-                    if stop_event.is_set():
+        pts = path.get_points()  # float32 view, shared by all samples without conversion
+        batch_cost = getattr(cost_function, 'batch', None) if cost_function else None
+        # every candidate differs from `path` only at idx, so with a delta form
+        # each one is priced from baseline_cost instead of over the whole path
+        delta_cost = getattr(cost_function, 'delta', None) if cost_function else None
+        batched = None
+        if batch_cost is not None and (dem is None or hasattr(dem, 'get_elevations_vec')):
+            if stopped():
+                return best_path
+            batched = self._sample_batch(dem, pts, idx, radius, batch_cost)
+        if batched is not None:
+            c, cand_pts = batched
+            if c < best_cost:
+                best_cost = c
+                best_path = path_cls(dem)
+                best_path.points = cand_pts
+                _remember_stamp(cost_function, best_path, float(c))
+                self._last_move = (idx, float(cand_pts[idx, 0]) - float(pts[idx, 0]), float(cand_pts[idx, 1]) - float(pts[idx, 1]))
+        n_loop = 0 if batched is not None else self.samples
+        angles = self._rng.uniform(0, 2 * np.pi, n_loop)
+        radii = self._rng.uniform(0, radius, n_loop)
+        offsets_x = radii * np.cos(angles)
+        offsets_y = radii * np.sin(angles)
+        pooled_cands = pooled_costs = None
+        scratch = self._scratch_path(path_cls, dem)
+        if (self.parallel and cost_function and delta_cost is None and n_loop >= 4
+                and n >= self.parallel_min_points):
+            if stopped():
+                return best_path
+            pooled_cands = [self._make_candidate(path_cls, dem, pts, idx, offsets_x[s], offsets_y[s])
+                            for s in range(n_loop)]
+            pooled_costs = self._pooled_costs(cost_function, pooled_cands)
+        for s in range(n_loop):
+            if pooled_costs is not None:
+                cand = pooled_cands[s]
+                c = pooled_costs[s]
+            else:
+                cand = self._fill_candidate(scratch, pts, idx, offsets_x[s], offsets_y[s])
+                if cost_function:
+                    # one stop check per candidate, before the expensive cost evaluation
+                    if stopped():
                         return best_path
-                except Exception:
-                    pass
-            angle = random.uniform(0, 2 * math.pi)
-            r = random.uniform(0, radius)
-            dx = r * math.cos(angle)
-            dy = r * math.sin(angle)
-            cand = self._make_candidate(path_cls, dem, pts, idx, dx, dy)
-            if cost_function:
-                # check stop_event before expensive cost evaluation
-                if stop_event is not None:
                     try:
-                        if stop_event.is_set():
-                            return best_path
+                        c = self._move_cost(cost_function, delta_cost, path, baseline_cost, cand, idx)
                     except Exception:
-                        pass
-                try:
-                    c = cost_function(cand)
-                except Exception:
-                    c = float('inf')
-            else:
-                c = 0.0
+                        c = float('inf')
+                else:
+                    c = 0.0
             if c < best_cost:
                 best_cost = c
-                best_path = cand
+                best_path = cand if cand is not scratch else cand.shallow_copy()
                 # record candidate move: compute displacement of idx
                 moved_pt = cand.get_point(idx)
-                orig_pt = pts[idx]
+                orig_pt = path.get_point(idx)
                 self._last_move = (idx, moved_pt[0] - orig_pt[0], moved_pt[1] - orig_pt[1])
-                try:
-                    print(f"SinglePointMover: improvement found at idx={idx}, dcost={best_cost - baseline_cost:.3f}")
-                except Exception:
-                    pass
+                if self.verbose:
+                    try:
+                        print(f"SinglePointMover: improvement found at idx={idx}, dcost={best_cost - baseline_cost:.3f}")
+                    except Exception:
+                        pass
 
         # local hill-climb around best candidate (if improved)
+        climb_samples = max(8, self.samples // 2)
         climb_steps = 0
         while climb_steps < self.max_climb_steps:
             improved = False
-            # sample a smaller neighborhood
-            for _ in range(max(8, self.samples // 2)):
-                # stop check inside inner hill-climb loop
-                if stop_event is not None:
-                    try:
-                        if stop_event.is_set():
-                            return best_path
-                    except Exception:
-                        pass
-                angle = random.uniform(0, 2 * math.pi)
-                r = random.uniform(0, radius * (0.5 ** (climb_steps + 1)))
-                dx = r * math.cos(angle)
-                dy = r * math.sin(angle)
-                # use pts from best_path if available to build candidate faster
-                cand_pts = best_path.get_points()
-                cand = self._make_candidate(path_cls, dem, cand_pts, idx, dx, dy)
+            # sample a smaller neighborhood, all offsets for this step drawn at once
+            angles = self._rng.uniform(0, 2 * np.pi, climb_samples)
+            radii = self._rng.uniform(0, radius * (0.5 ** (climb_steps + 1)), climb_samples)
+            offsets_x = radii * np.cos(angles)
+            offsets_y = radii * np.sin(angles)
+            # candidates are built from best_path's points; refreshed only when it changes
+            cand_pts = best_path.get_points()
+            # offsets tried from the current cand_pts, rounded to 1e-4 px: once the
+            # radius is small, redrawing (numerically) the same move is common
+            tried = set()
+            for s in range(climb_samples):
+                key = (round(offsets_x[s] * 1e4), round(offsets_y[s] * 1e4))
+                if key in tried:
+                    continue
+                tried.add(key)
+                cand = self._fill_candidate(scratch, cand_pts, idx, offsets_x[s], offsets_y[s])
                 if cost_function:
-                    # check stop_event before expensive cost evaluation
-                    if stop_event is not None:
-                        try:
-                            if stop_event.is_set():
-                                return best_path
-                        except Exception:
-                            pass
+                    # one stop check per candidate, before the expensive cost evaluation
+                    if stopped():
+                        return best_path
                     try:
-                        c = cost_function(cand)
+                        c = self._move_cost(cost_function, delta_cost, path, baseline_cost, cand, idx)
                     except Exception:
                         c = float('inf')
                 else:
                     c = 0.0
                 if c < best_cost:
                     best_cost = c
-                    best_path = cand
+                    best_path = cand.shallow_copy()
+                    cand_pts = best_path.get_points()
+                    tried.clear()
                     improved = True
                     # record last move for solver notification
                     moved_pt = cand.get_point(idx)
-                    orig_pt = pts[idx]
+                    orig_pt = path.get_point(idx)
                     self._last_move = (idx, moved_pt[0] - orig_pt[0], moved_pt[1] - orig_pt[1])
-                    try:
-                        print(f"SinglePointMover: hill-climb improved idx={idx}, dcost={best_cost - baseline_cost:.3f}")
-                    except Exception:
-                        pass
+                    if self.verbose:
+                        try:
+                            print(f"SinglePointMover: hill-climb improved idx={idx}, dcost={best_cost - baseline_cost:.3f}")
+                        except Exception:
+                            pass
+                    if self.first_improvement:
+                        break
             if not improved:
                 break
             climb_steps += 1
@@ -202,6 +404,8 @@ class SinglePointMover:
         # reset _last_move if no improvement found
         if best_path is path:
             self._last_move = None
+        else:
+            self.changed_index = idx
         return best_path
 
     def on_move_accepted(self, old_path, new_path):
@@ -0,0 +1,32 @@
+"""
+Numba kernels for building SinglePointMover candidates.
+
+Each kernel copies the parent's (N, 3) float32 points into a new array and
+applies the move in the same pass. Moved coordinates are summed in float64
+and rounded to float32 once, exactly as xyzPath.shift_point() stores them, so
+the compiled and NumPy paths build identical candidates.
+"""
+import numpy as np
+from numba_compat import njit
+
+
+@njit(cache=True)
+def build_candidate_nb(pts, idx, dx, dy):
+    """Copy of `pts` with point `idx` moved by (dx, dy)."""
+    out = pts.copy()
+    out[idx, 0] = np.float64(pts[idx, 0]) + dx
+    out[idx, 1] = np.float64(pts[idx, 1]) + dy
+    return out
+
+
+@njit(cache=True)
+def build_propagated_nb(pts, center, dx, dy, frac):
+    """Copy of `pts` with `center` moved by (dx, dy) and its neighbours by frac * (dx, dy)."""
+    out = pts.copy()
+    n = pts.shape[0]
+    for j in range(center - 1, center + 2):
+        if 0 <= j < n:
+            f = 1.0 if j == center else frac
+            out[j, 0] = np.float64(pts[j, 0]) + dx * f
+            out[j, 1] = np.float64(pts[j, 1]) + dy * f
+    return out
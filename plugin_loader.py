@@ -1,16 +1,72 @@
 import os
 import sys
 import importlib.util
+import functools
+
+import numpy as np
+from numba_compat import NUMBA_AVAILABLE
+
+
+def _kernel_dispatcher(func):
+    """
+    func(path, time) replaced by a call to its compiled `numba_kernel`,
+    which takes a contiguous float64 (N, 3) points array and the time.
+    """
+    kernel = func.numba_kernel
+
+    @functools.wraps(func)
+    def dispatch(path, time):
+        points = np.ascontiguousarray(path.get_points(), dtype=np.float64)
+        return float(kernel(points, time))
+    return dispatch
+
+
+def _remember_last(func):
+    """
+    func(path, time) that returns its previous result when called again with
+    the same path contents and time. Paths are matched by their content stamp
+    (xyzPath._version), so any edit to the path is a miss.
+    """
+    last = [None]
+
+    @functools.wraps(func)
+    def cached(path, time):
+        stamp = getattr(path, '_version', None)
+        entry = last[0]
+        if stamp is not None and entry is not None and entry[0] == (stamp, time):
+            return entry[1]
+        cost = func(path, time)
+        if stamp is not None:
+            last[0] = ((stamp, time), cost)
+        return cost
+    return cached
+
 
 class PluginLoader:
     """Load solvers and cost functions dynamically from files"""
     
-    @staticmethod
-    def load_solvers():
+    # Results of the first load, reused until reload()
+    _solvers = None
+    _cost_functions = None
+    
+    @classmethod
+    def reload(cls):
+        """Forget loaded plugins so the next load_* call scans and imports them again."""
+        cls._solvers = None
+        cls._cost_functions = None
+    
+    @classmethod
+    def load_solvers(cls):
         """
-        Load all solvers from the solvers folder.
+        Load all solvers from the solvers folder (imported once, then cached).
         Returns dict of {solver_name: module}
         """
+        if cls._solvers is None:
+            cls._solvers = cls._scan_solvers()
+        return dict(cls._solvers)
+    
+    @staticmethod
+    def _scan_solvers():
         solvers = {}
         solvers_dir = os.path.join(os.path.dirname(__file__), 'solvers')
         
@@ -36,13 +92,24 @@ class PluginLoader:
         
         return solvers
     
-    @staticmethod
-    def load_cost_functions():
+    @classmethod
+    def load_cost_functions(cls):
         """
-        Load all cost functions from cost_functions.py.
+        Load all cost functions from cost_functions.py (scanned once, then cached).
         Returns dict of {function_display_name: function}
         Uses the docstring of each function as its display name.
+
+        A function may set a `numba_kernel(points, time)` attribute; when Numba
+        is installed it is called in place of the function's Python body. Each
+        returned function also short-circuits a repeat call on an unchanged
+        path and time. Attributes such as `delta` and `batch` are kept.
         """
+        if cls._cost_functions is None:
+            cls._cost_functions = cls._scan_cost_functions()
+        return dict(cls._cost_functions)
+    
+    @staticmethod
+    def _scan_cost_functions():
         cost_funcs = {}
         
         try:
@@ -56,7 +123,9 @@ class PluginLoader:
                     # Use the function's docstring as the display name
                     display_name = obj.__doc__ if obj.__doc__ else name
                     display_name = display_name.strip()
-                    cost_funcs[display_name] = obj
+                    if NUMBA_AVAILABLE and hasattr(obj, 'numba_kernel'):
+                        obj = _kernel_dispatcher(obj)
+                    cost_funcs[display_name] = _remember_last(obj)
         except Exception as e:
             print(f"Error loading cost functions: {e}")
         
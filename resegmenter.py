@@ -38,41 +38,34 @@ def resegment(path, target_point_count):
     # Distribute remainder to segments with highest fractional parts
     fractional_parts = points_per_segment - np.floor(points_per_segment)
     if remainder > 0:
-        top_indices = np.argsort(fractional_parts)[-remainder:]
-        for idx in top_indices:
-            points_to_add_per_segment[idx] += 1
+        # argsort indices are distinct, so one fancy-indexed add covers them all
+        points_to_add_per_segment[np.argsort(fractional_parts)[-remainder:]] += 1
     
-    # Build new path by interpolating points
-    new_points = []
+    # Build new path by interpolating points, all segments at once:
+    # segment s gets k = points_to_add_per_segment[s] points at t = i / (k + 1), i = 1..k
     original_points = path.get_points()
-    
-    for seg_idx in range(len(segments)):
-        # Add the starting point of this segment
-        new_points.append(original_points[seg_idx].copy())
-        
-        # Add interpolated points for this segment
-        num_new_points = points_to_add_per_segment[seg_idx]
-        if num_new_points > 0:
-            p1 = original_points[seg_idx]
-            p2 = original_points[seg_idx + 1]
-            
-            for i in range(1, num_new_points + 1):
-                # Linear interpolation
-                t = i / (num_new_points + 1)
-                interp_point = p1 + t * (p2 - p1)
-                new_points.append(interp_point)
-    
-    # Add the final point
-    new_points.append(original_points[-1].copy())
+    counts = points_to_add_per_segment
+    seg_ids = np.repeat(np.arange(len(segments)), counts)
+    first = np.cumsum(counts) - counts  # offset of each segment's first new point
+    local_idx = np.arange(1, len(seg_ids) + 1) - np.repeat(first, counts)
+    t = local_idx / (counts[seg_ids] + 1)
+    deltas = np.diff(original_points, axis=0)
+    interpolated = original_points[seg_ids] + t[:, None] * deltas[seg_ids]  # float64, as before
+    
+    # Interleave: original point j lands after all new points of segments before it
+    new_points = np.empty((len(original_points) + len(seg_ids), original_points.shape[1]), dtype=original_points.dtype)
+    is_original = np.zeros(len(new_points), dtype=bool)
+    is_original[np.arange(len(original_points)) + np.concatenate(([0], np.cumsum(counts)))] = True
+    new_points[is_original] = original_points
+    new_points[~is_original] = interpolated
     
     # Create new path with the same DEM
     from path import xyzPath
     new_path = xyzPath(path.dem)
     new_path.locked = path.locked
     
-    # Add all points to the new path
-    for point in new_points:
-        new_path.points.append(list(point))
+    # Hand the freshly built array to the new path instead of copying it
+    new_path.adopt_points(new_points)
     
     return new_path
 
@@ -96,51 +89,32 @@ def simplify(path, tolerance=1e-3):
         from path import xyzPath
         new_path = xyzPath(path.dem)
         new_path.locked = path.locked
-        for point in original_points:
-            new_path.points.append(list(point))
+        new_path.points = original_points
         return new_path
     
-    # Keep track of which points to keep
-    points_to_keep = [0]  # Always keep the first point
+    # Vectors into and out of every interior point, all at once
+    v1 = original_points[1:-1] - original_points[:-2]  # prev -> curr
+    v2 = original_points[2:] - original_points[1:-1]   # curr -> next
+    len_v1 = np.linalg.norm(v1, axis=1)
+    len_v2 = np.linalg.norm(v2, axis=1)
     
-    for i in range(1, len(original_points) - 1):
-        p_prev = original_points[i - 1]
-        p_curr = original_points[i]
-        p_next = original_points[i + 1]
-        
-        # Calculate vectors
-        v1 = p_curr - p_prev  # Vector from prev to curr
-        v2 = p_next - p_curr  # Vector from curr to next
-        
-        # Normalize vectors
-        len_v1 = np.linalg.norm(v1)
-        len_v2 = np.linalg.norm(v2)
-        
-        if len_v1 < tolerance or len_v2 < tolerance:
-            # Degenerate case - keep the point
-            points_to_keep.append(i)
-            continue
-        
-        v1_norm = v1 / len_v1
-        v2_norm = v2 / len_v2
-        
-        # Calculate cross product (in 3D this gives a vector perpendicular to both)
-        cross = np.cross(v1_norm, v2_norm)
-        cross_magnitude = np.linalg.norm(cross)
-        
-        # If cross product magnitude is above tolerance, points are NOT collinear
-        if cross_magnitude > tolerance:
-            points_to_keep.append(i)
+    # Degenerate case (a zero-length neighbour segment) - keep the point
+    degenerate = (len_v1 < tolerance) | (len_v2 < tolerance)
+    
+    # If cross product magnitude of the unit vectors is above tolerance, points are NOT collinear;
+    # |v1 x v2| / (|v1| |v2|) > tolerance, compared without normalizing either vector
+    bent = np.linalg.norm(np.cross(v1, v2), axis=1) > tolerance * len_v1 * len_v2
     
-    points_to_keep.append(len(original_points) - 1)  # Always keep the last point
+    # Always keep the first and last point
+    points_to_keep = np.concatenate(([0], np.nonzero(degenerate | bent)[0] + 1, [len(original_points) - 1]))
     
     # Create new path with only the kept points
     from path import xyzPath
     new_path = xyzPath(path.dem)
     new_path.locked = path.locked
     
-    for i in points_to_keep:
-        new_path.points.append(list(original_points[i]))
+    # fancy indexing already made a fresh array; the new path adopts it as is
+    new_path.adopt_points(original_points[points_to_keep])
     
     return new_path
 
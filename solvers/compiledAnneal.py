@@ -0,0 +1,159 @@
+# Standard libs
+import math
+import numpy as np
+from numba_compat import NUMBA_AVAILABLE
+from solvers import simulatedAnneal
+from solvers.compiledAnneal_nb import anneal_nb, anneal_chains_nb, seed_nb, SPAN_KINDS
+
+name = "Simulated Anneal (compiled)"
+
+# Same starting temperature rule as simulatedAnneal: a move 5% worse than the
+# starting cost is accepted with probability 0.5. T shrinks by 1000x over
+# MAX_ITERS iterations and never drops below MIN_TEMPERATURE_FRACTION * T0
+START_WORSENING = 0.05
+MAX_ITERS = 200000
+COOLING_RATE = (1e-3) ** (1 / MAX_ITERS)
+MIN_TEMPERATURE_FRACTION = 1e-4
+# The kernel runs CHUNK_ITERS iterations per call; between calls the solver
+# reports progress, checks the stop event and rescales the step
+CHUNK_ITERS = 5000
+# Stop once best_cost hasn't improved for PLATEAU_CHUNKS chunks
+PLATEAU_CHUNKS = 8
+# Gaussian step per coordinate, as a fraction of the mean segment length
+# (SinglePointMover's movement radius), at least 1 DEM pixel
+STEP_FRACTION = 0.25
+# Upper bound for the `chains` argument (the viewer's Chains spinbox)
+MAX_CHAINS = 64
+
+def _step_radius(points):
+    """Gaussian move scale for `points`: STEP_FRACTION of the mean segment length."""
+    seg = np.diff(points.astype(np.float64), axis=0)
+    if len(seg) == 0:
+        return 1.0
+    return max(1.0, STEP_FRACTION * float(np.mean(np.sqrt((seg * seg).sum(axis=1)))))
+
+def _as_path(template, points):
+    """New path on `template`'s DEM, with its locked state, holding a copy of `points`."""
+    out = template.__class__(template.dem)
+    out.adopt_points(points.copy())
+    out.locked = template.locked
+    return out
+
+def warmup(dem=None):
+    """
+    Compile (or load from Numba's cache) both annealing kernels on a
+    throwaway 4-point path, so a run doesn't start with that delay. `dem`,
+    if given, sets the DEM array dtype to compile for.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    dem_arr = dem.get_array() if hasattr(dem, 'get_array') else None
+    dtype = dem_arr.dtype if dem_arr is not None else np.float32
+    grid = np.zeros((4, 4), dtype=dtype)
+    stop_flag = np.zeros(1, dtype=np.uint8)
+    points = np.array([[0.5, 0.5, 0], [1.5, 1.5, 0], [2.5, 2.5, 0], [3.5, 3.5, 0]], dtype=np.float32)
+    anneal_nb(points, points.copy(), grid, 0, 1.0, np.zeros(2), 1.0, np.zeros(8), stop_flag)
+    chains = np.repeat(points[None], 2, axis=0)
+    anneal_chains_nb(chains, chains.copy(), grid, 0, 1.0, np.zeros((2, 2)), np.ones(2),
+                     np.zeros((2, 8)), stop_flag, 0)
+
+def optimize(path, cost_function, perturbers, callback=None, stop_event=None, verbose=False, chains=1):
+    """
+    Simulated annealing with the whole Metropolis loop compiled.
+    Each iteration moves one random interior point by a Gaussian step and
+    prices it with the span kernel over the two segments it touches; the
+    point count stays fixed and the endpoints never move.
+    Args:
+        path: xyzPath object (will not be modified)
+        cost_function: function(path) -> float carrying `span`, one of the
+            span kernels in cost_functions_nb (see SPAN_KINDS), and `time`,
+            the time value to pass it
+        perturbers: unused by the compiled loop; passed on to
+            simulatedAnneal.optimize when falling back
+        callback: optional function(path, cost, iter_count) called after each chunk of iterations
+        verbose: if True, print progress after each chunk
+        chains: number of independent chains started from `path` and run
+            in parallel threads (up to MAX_CHAINS); the best result of all
+            of them is returned. Iteration counts are per chain
+    Falls back to simulatedAnneal.optimize when Numba is missing, the cost
+    function has no known span kernel, the DEM is not held in memory or the path
+    has fewer than 3 points.
+    Returns:
+        best_path: xyzPath object (copy)
+        best_cost: float
+    """
+    kind = SPAN_KINDS.get(getattr(cost_function, 'span', None))
+    time_val = getattr(cost_function, 'time', None)
+    dem = getattr(path, 'dem', None)
+    dem_arr = dem.get_array() if hasattr(dem, 'get_array') else None
+    if (not NUMBA_AVAILABLE or kind is None or time_val is None or dem_arr is None
+            or path.get_point_count() < 3):
+        return simulatedAnneal.optimize(path, cost_function, perturbers, callback=callback,
+                                        stop_event=stop_event, verbose=verbose)
+
+    chains = min(max(1, int(chains)), MAX_CHAINS)
+    start = np.array(path.get_points(), dtype=np.float32, order='C')
+    # one row per chain, all starting from the same points
+    points = np.repeat(start[None], chains, axis=0)
+    best = points.copy()
+    current_cost = cost_function(path)
+    temperature = -START_WORSENING * current_cost / math.log(0.5) / (len(start) - 1)
+    if not temperature > 0:
+        # zero or negative starting cost: scale by its magnitude instead
+        temperature = max(abs(temperature), 1e-6)
+    # the whole schedule up front; each chunk turns its slice into acceptance
+    # thresholds -T*log(u) for the kernel
+    schedule = simulatedAnneal.cooling_schedule(temperature, MAX_ITERS, COOLING_RATE,
+                                                temperature * MIN_TEMPERATURE_FRACTION)
+    state = np.tile(np.array([current_cost, current_cost], dtype=np.float64), (chains, 1))
+    if chains == 1:
+        # anneal_nb draws from the calling thread's generator, seeded once per run
+        seed_nb(int(np.random.randint(0, 2**31 - 1)))
+    # the kernel polls a StopFlag's array itself; a plain Event is only
+    # checked between chunks, through this never-set stand-in
+    stop_flag = getattr(stop_event, 'flag', None)
+    if not isinstance(stop_flag, np.ndarray) or stop_flag.dtype != np.uint8 or stop_flag.shape != (1,):
+        stop_flag = np.zeros(1, dtype=np.uint8)
+
+    iter_count = 0
+    last_improve_chunk = 0
+    chunk = 0
+    best_cost = current_cost
+    k = 0  # chain holding best_cost
+    while iter_count < MAX_ITERS:
+        # Allow external stop request
+        if stop_event is not None:
+            try:
+                if stop_event.is_set():
+                    break
+            except Exception:
+                pass
+        iters = min(CHUNK_ITERS, MAX_ITERS - iter_count)
+        thresholds = -schedule[iter_count:iter_count + iters] * np.log(np.random.random((chains, iters)))
+        if chains == 1:
+            # a single chain skips the parallel region's thread dispatch
+            done, accepted, _ = anneal_nb(points[0], best[0], dem_arr, kind, float(time_val), state[0],
+                                          _step_radius(points[0]), thresholds[0], stop_flag)
+        else:
+            radii = np.array([_step_radius(p) for p in points])
+            # a fresh base seed per chunk: chain k seeds itself with base_seed + k,
+            # and reusing one base would replay the same moves every chunk
+            base_seed = int(np.random.randint(0, 2**31 - 1 - chains))
+            done, accepted = anneal_chains_nb(points, best, dem_arr, kind, float(time_val), state,
+                                              radii, thresholds, stop_flag, base_seed)
+        iter_count += done
+        chunk += 1
+        k = int(np.argmin(state[:, 1]))
+        if state[k, 1] < best_cost:
+            best_cost = float(state[k, 1])
+            last_improve_chunk = chunk
+        if verbose:
+            print(f"Solver: iter={iter_count} accepted={accepted} cost={state[k, 0]:.4f} best={best_cost:.4f} T={schedule[iter_count - 1]:.4g}")
+        if callback:
+            callback(_as_path(path, best[k]), best_cost, iter_count)
+        if done < iters or chunk - last_improve_chunk >= PLATEAU_CHUNKS:
+            break
+
+    best_path = _as_path(path, best[k])
+    # the kernel accumulates deltas, which can drift by rounding; report the exact cost
+    return best_path, cost_function(best_path)
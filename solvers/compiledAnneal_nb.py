@@ -0,0 +1,121 @@
+"""
+Numba kernel for the compiled annealing solver (solvers/compiledAnneal.py).
+
+The whole Metropolis loop runs here on the path's raw (N, 3) float32 points:
+one random interior point is nudged per iteration, its z read straight from
+the DEM array, and the move priced with the cost function's span kernel over
+the two segments it touches. No Python objects are created per iteration.
+anneal_chains_nb runs several independent chains of it in parallel threads.
+"""
+import numpy as np
+from numba_compat import njit, prange
+from cost_functions_nb import re3_span_nb, acsm_span_nb, ihc_span_nb
+
+# Span kernels anneal_nb can price moves with, by the `kind` it is passed. They
+# are called directly rather than passed in as a function argument, which
+# Numba would recompile in every new process instead of loading from its cache
+SPAN_KINDS = {re3_span_nb: 0, acsm_span_nb: 1, ihc_span_nb: 2}
+
+
+@njit(cache=True, nogil=True)
+def _span(kind, points, lo, hi, time):
+    if kind == 0:
+        return re3_span_nb(points, lo, hi, time)
+    if kind == 1:
+        return acsm_span_nb(points, lo, hi, time)
+    return ihc_span_nb(points, lo, hi, time)
+
+
+@njit(cache=True)
+def seed_nb(seed):
+    """Seed Numba's random generator (separate from NumPy's) for anneal_nb."""
+    np.random.seed(seed)
+
+
+@njit(cache=True, nogil=True)
+def anneal_nb(points, best, dem, kind, time, state, radius, thresholds, stop_flag):
+    """
+    Run one annealing iteration per entry of `thresholds` on `points` in
+    place, pricing moves with the span kernel numbered `kind` in SPAN_KINDS.
+    A worsening move is accepted when its cost increase is below the
+    iteration's threshold, -T * log(u) for a uniform u drawn by the caller:
+    the Metropolis test u < exp(-delta/T) with no exp in the loop.
+
+    `state` is a float64 array [current_cost, best_cost] carried from one
+    call to the next; `best` is
+    overwritten with `points` whenever best_cost improves. Moves that leave
+    the DEM or land on NaN are rejected. Moved coordinates are rounded to
+    float32 once, as xyzPath.shift_point() stores them.
+
+    The loop ends early once another thread sets stop_flag[0] (a uint8
+    array, see numba_compat.StopFlag).
+
+    Returns (iterations run, accepted moves, last iteration that improved
+    best_cost or -1).
+    """
+    n = points.shape[0]
+    h, w = dem.shape
+    current = state[0]
+    best_cost = state[1]
+    accepted = 0
+    improved = -1
+    iters = thresholds.shape[0]
+    for it in range(iters):
+        if stop_flag[0]:
+            iters = it
+            break
+        idx = np.random.randint(1, n - 1)
+        nx = np.float32(np.float64(points[idx, 0]) + np.random.normal(0.0, radius))
+        ny = np.float32(np.float64(points[idx, 1]) + np.random.normal(0.0, radius))
+        xi = int(nx)
+        yi = int(ny)
+        if 0 <= xi < w and 0 <= yi < h:
+            nz = np.float32(dem[yi, xi])
+            if nz == nz:
+                ox = points[idx, 0]
+                oy = points[idx, 1]
+                oz = points[idx, 2]
+                before = _span(kind, points, idx - 1, idx + 1, time)
+                points[idx, 0] = nx
+                points[idx, 1] = ny
+                points[idx, 2] = nz
+                delta = _span(kind, points, idx - 1, idx + 1, time) - before
+                # Metropolis criterion: always accept improvements, accept worsening with exp(-delta/T).
+                # Taking or undoing the move is written as selects rather than an
+                # if/else, which LLVM lowers without a (poorly predicted) branch
+                accept = (delta <= 0.0) | (delta < thresholds[it])
+                points[idx, 0] = nx if accept else ox
+                points[idx, 1] = ny if accept else oy
+                points[idx, 2] = nz if accept else oz
+                current += delta if accept else 0.0
+                accepted += accept
+                if current < best_cost:
+                    best_cost = current
+                    best[:, :] = points
+                    improved = it
+    state[0] = current
+    state[1] = best_cost
+    return iters, accepted, improved
+
+
+@njit(cache=True, nogil=True, parallel=True)
+def anneal_chains_nb(points, best, dem, kind, time, state, radii, thresholds, stop_flag, base_seed):
+    """
+    anneal_nb on K independent chains at once, one per prange iteration.
+
+    `points`/`best` are (K, N, 3), `state` is (K, 2), `radii` is (K,) and
+    `thresholds` is (K, iters): chain k works on row k of each. Chain k
+    seeds the random generator of the thread it runs on with base_seed + k
+    before its first move, so its moves do not depend on which thread
+    picks it up.
+
+    Returns (fewest iterations any chain ran, accepted moves over all chains).
+    """
+    k = points.shape[0]
+    done = np.empty(k, dtype=np.int64)
+    accepted = np.empty(k, dtype=np.int64)
+    for c in prange(k):
+        np.random.seed(base_seed + c)
+        done[c], accepted[c], _ = anneal_nb(points[c], best[c], dem, kind, time, state[c],
+                                            radii[c], thresholds[c], stop_flag)
+    return done.min(), accepted.sum()
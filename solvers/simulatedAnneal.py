@@ -2,7 +2,7 @@
 import math
 import numpy as np
 import copy
-import random
+import inspect
 # Import SinglePointMover
 from perturbers.singlePointMover import SinglePointMover
 # Import resegment helper
@@ -10,14 +10,97 @@ from resegmenter import resegment
 
 name = "Custom Solver"
 
-def optimize(path, cost_function, perturbers, callback=None, stop_event=None):
+# Cooling schedule: T0 = -0.05 * |f0| / ln(0.5), i.e. a move worse by 5% of the
+# starting cost's magnitude (costs can be negative, e.g. ACSM downhill) is
+# accepted with probability 0.5; T shrinks by 1000x over 1000 iterations
+START_WORSENING = 0.05
+COOLING_RATE = (1e-3) ** (1 / 1000)
+# SinglePointMover only proposes local improvements plus small propagation
+# nudges, so freezing completely just stalls the search; T never drops below
+# MIN_TEMPERATURE_FRACTION * T0 (reached after about 2/3 of MAX_ITERS)
+MIN_TEMPERATURE_FRACTION = 1e-2
+# Convergence: a cooling step is ITERS_PER_STEP iterations; stop after
+# STALL_STEPS consecutive steps without a single accepted move
+ITERS_PER_STEP = 10
+STALL_STEPS = 30
+# Plateau: stop once best_cost hasn't improved for PLATEAU_ITERS iterations,
+# but never before MIN_ITERS
+PLATEAU_ITERS = 200
+MIN_ITERS = 300
+# Iteration cap (the previous fixed budget)
+MAX_ITERS = 1000
+# Iteration interval for verbose progress output
+VERBOSE_EVERY = 50
+
+def cooling_schedule(t0, iters, rate, floor):
+    """
+    Temperatures of `iters` iterations of geometric cooling from `t0`:
+    t0 * rate**i, floored at `floor`, as a float64 array.
+    """
+    return np.maximum(t0 * rate ** np.arange(iters, dtype=np.float64), floor)
+
+def _bind_perturb(perturber, cost_function, stop_event):
+    """
+    Return fn(path) calling perturber.perturb with as many of
+    (cost_function, stop_event) as its signature accepts, resolved once.
+    """
+    perturb = perturber.perturb
+    try:
+        params = list(inspect.signature(perturb).parameters.values())
+    except (TypeError, ValueError):
+        # signature not introspectable: fall back to trying each arity per call
+        def call(p):
+            try:
+                return perturb(p, cost_function, stop_event)
+            except TypeError:
+                try:
+                    return perturb(p, cost_function)
+                except TypeError:
+                    return perturb(p)
+        return call
+    positional = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+    if any(p.kind == inspect.Parameter.VAR_POSITIONAL for p in params):
+        extra = 2
+    else:
+        extra = sum(1 for p in params if p.kind in positional) - 1  # first one is the path
+    if extra >= 2:
+        return lambda p: perturb(p, cost_function, stop_event)
+    if extra == 1:
+        return lambda p: perturb(p, cost_function)
+    return perturb
+
+def _incremental_cost(delta_cost, current_path, current_cost, new_path, index):
+    """
+    Cost of `new_path` from `current_cost` via the cost function's delta form,
+    trusting the perturber's `changed_index` that `new_path` differs from
+    `current_path` only at point `index`. Returns None (full evaluation
+    needed) if the point counts differ or the index is unknown.
+    """
+    n = new_path.get_point_count()
+    if index is None or n != current_path.get_point_count() or not 0 <= index < n:
+        return None
+    try:
+        return delta_cost(current_path, new_path, index, current_cost)
+    except Exception:
+        return None
+
+def optimize(path, cost_function, perturbers, callback=None, stop_event=None, verbose=False):
     """
-    Custom optimization logic that allows increases in cost up to 1 and any decrease.
+    Simulated annealing with Metropolis acceptance and geometric cooling.
+    Decreases in cost are always accepted; an increase delta is accepted with
+    probability exp(-delta / T), with T floored at MIN_TEMPERATURE_FRACTION * T0. The run stops once
+    STALL_STEPS consecutive cooling steps have accepted no move, when
+    best_cost has not improved for PLATEAU_ITERS iterations, or after MAX_ITERS
+    iterations.
     Args:
         path: xyzPath object (will not be modified)
-        cost_function: function(path) -> float
+        cost_function: function(path) -> float; may carry a
+            delta(old_path, new_path, index, old_cost) -> float attribute used to
+            price single-point moves from perturbers exposing `changed_index`,
+            on paths of at least its `delta_min_points` attribute (if any) points
         perturbers: list of perturber modules, each with a perturb(path) -> xyzPath method
         callback: optional function(path, cost, iter_count) called every N iterations to visualize progress
+        verbose: if True, print the move outcome every VERBOSE_EVERY iterations
     Returns:
         best_path: xyzPath object (copy)
         best_cost: float
@@ -33,7 +116,7 @@ def optimize(path, cost_function, perturbers, callback=None, stop_event=None):
     perturber_objs = []
     for p in perturbers:
         if hasattr(p, "SinglePointMover"):
-            perturber_objs.append(p.SinglePointMover(spacing=10.0))
+            perturber_objs.append(p.SinglePointMover(spacing=10.0, verbose=verbose))
         else:
             perturber_objs.append(p)
 
@@ -42,9 +125,35 @@ def optimize(path, cost_function, perturbers, callback=None, stop_event=None):
 
     # bind locals for speed
     cost_fn = cost_function
+    delta_cost = getattr(cost_function, 'delta', None)
+    # below this point count a full evaluation is cheaper than the delta
+    delta_min_points = getattr(cost_function, 'delta_min_points', 0)
+    used_delta = False
     stop_ev = stop_event
     perturbers_local = perturber_objs
 
+    # call form of each perturber's perturb(), resolved once instead of per iteration
+    perturb_fns = [_bind_perturb(p, cost_fn, stop_ev) for p in perturbers_local]
+
+    max_iters = MAX_ITERS
+    # Draw every iteration's perturber up front instead of scalar random calls per iteration
+    perturber_choices = np.random.randint(0, len(perturbers_local), max_iters)
+    # Perturbers work on this scratch copy, refreshed in place from current_path each iteration
+    scratch_path = current_path.shallow_copy()
+
+    temperature = -START_WORSENING * abs(current_cost) / math.log(0.5)
+    if not temperature > 0:
+        # zero starting cost: no scale to take the temperature from
+        temperature = 1e-6
+    # Metropolis test u < exp(-delta/T) taken as delta < -T*log(u): the
+    # uniforms' logs and the whole cooling schedule are combined up front
+    accept_thresholds = -cooling_schedule(temperature, max_iters, COOLING_RATE,
+                                         temperature * MIN_TEMPERATURE_FRACTION) \
+        * np.log(np.random.random(max_iters))
+    step_accepted = 0
+    stalled_steps = 0
+    last_improve_iter = 0
+
     while True:
         # Allow external stop request
         if stop_event is not None:
@@ -55,19 +164,12 @@ def optimize(path, cost_function, perturbers, callback=None, stop_event=None):
                 # In case a non-threading.Event-like object is passed
                 pass
         # Pick a random perturber
-        perturber = random.choice(perturbers_local)
-        # Allow perturbers that accept optional cost_function and stop_event; try to pass stop_event
-        # create a single shallow copy for this perturb call
-        path_copy = current_path.shallow_copy()
-        try:
-            new_path = perturber.perturb(path_copy, cost_fn, stop_ev)
-        except TypeError:
-            try:
-                # maybe perturber expects (path, cost_function)
-                new_path = perturber.perturb(path_copy, cost_fn)
-            except TypeError:
-                # final fallback: only path
-                new_path = perturber.perturb(path_copy)
+        choice = perturber_choices[iter_count]
+        perturber = perturbers_local[choice]
+        # refresh the scratch path for this perturb call
+        scratch_path.copy_from(current_path)
+        new_path = perturb_fns[choice](scratch_path)
+        resegmented = False
         # Ensure nodes aren't too far apart: require max segment length <= 5% of path length
         try:
             total_len = new_path.get_total_distance()
@@ -80,6 +182,7 @@ def optimize(path, cost_function, perturbers, callback=None, stop_event=None):
                     reseg = resegment(new_path, desired_points)
                     if reseg is not None:
                         new_path = reseg
+                        resegmented = True
         except Exception:
             # If anything goes wrong with resegment logic, continue with original candidate
             pass
@@ -92,23 +195,39 @@ def optimize(path, cost_function, perturbers, callback=None, stop_event=None):
             except Exception:
                 pass
 
-        new_cost = cost_fn(new_path)
+        new_cost = None
+        if new_path._version == current_path._version:
+            # the perturber found nothing and handed back the unchanged scratch copy
+            new_cost = current_cost
+        elif (delta_cost is not None and not resegmented and hasattr(perturber, 'changed_index')
+                and new_path.get_point_count() >= delta_min_points):
+            new_cost = _incremental_cost(delta_cost, current_path, current_cost, new_path, perturber.changed_index)
+            if new_cost is not None:
+                used_delta = True
+        if new_cost is None:
+            new_cost = cost_fn(new_path)
         delta = new_cost - current_cost
 
-        # Accept if better, or if the increase is less than or equal to 1
-        if delta <= 1:
-            old_current = current_path
-            current_path = new_path
+        # Metropolis criterion: always accept improvements, accept worsening with exp(-delta/T)
+        accepted = delta <= 0 or delta < accept_thresholds[iter_count]
+        if accepted:
+            if delta != 0:
+                # no-op moves (perturber found nothing) don't count towards the acceptance rate
+                step_accepted += 1
+            # O(1) buffer swap: current_path takes the candidate's points and
+            # new_path (often the scratch path) is left with the previous ones
+            current_path.take_ownership(new_path)
             current_cost = new_cost
             # Notify perturber about accepted move so it can propagate
             try:
                 if hasattr(perturber, 'on_move_accepted'):
-                    perturber.on_move_accepted(old_current, new_path)
+                    perturber.on_move_accepted(new_path, current_path)
             except Exception:
                 pass
             if new_cost < best_cost:
-                best_path = new_path.shallow_copy()
+                best_path = current_path.shallow_copy()
                 best_cost = new_cost
+                last_improve_iter = iter_count
         else:
             # If perturbation was rejected and perturber had a propagation plan, cancel it
             try:
@@ -116,24 +235,33 @@ def optimize(path, cost_function, perturbers, callback=None, stop_event=None):
                     perturber._propagation = None
             except Exception:
                 pass
-        # Debug logging for accepted/rejected moves
-        try:
-            if delta <= 1:
+        # Debug output for accepted/rejected moves
+        if verbose and iter_count % VERBOSE_EVERY == 0:
+            if accepted:
                 print(f"Solver: iter={iter_count} accepted delta={delta:.4f} cost={current_cost:.4f}")
             else:
                 print(f"Solver: iter={iter_count} rejected delta={delta:.4f} new_cost={new_cost:.4f}")
-        except Exception:
-            pass
 
         iter_count += 1
+        if iter_count % ITERS_PER_STEP == 0:
+            if step_accepted == 0:
+                stalled_steps += 1
+            else:
+                stalled_steps = 0
+            step_accepted = 0
         # Call callback every 10 iterations for GUI updates
         if callback and iter_count % 10 == 0:
             callback(best_path, best_cost, iter_count)
 
-        # Termination condition (example: fixed number of iterations)
-        if iter_count >= 1000:
+        # Termination: acceptance has dried up, best_cost has plateaued, or the cap is reached
+        if stalled_steps >= STALL_STEPS or iter_count >= max_iters:
+            break
+        if iter_count > MIN_ITERS and iter_count - last_improve_iter > PLATEAU_ITERS:
             break
 
+    if used_delta:
+        # incremental updates can drift by rounding; report the exact cost
+        best_cost = cost_fn(best_path)
     return best_path, best_cost
 
 # Example perturber interface:
@@ -147,4 +275,4 @@ def optimize(path, cost_function, perturbers, callback=None, stop_event=None):
 # import perturbers.gaussianRaindrops as gr
 # import perturbers.translateAll as ta
 # import perturbers.singlePointMover as spm
-# best_path, best_cost = optimize(path, acsm_equation, [gr, ta, spm], single_point_spacing=10.0)
+# best_path, best_cost = optimize(path, lambda p: acsm_equation(p, 1.0), [gr, ta, spm])
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from cost_functions import acsm_equation
+from numba_compat import NUMBA_AVAILABLE
+from path import xyzPath
+from solvers import compiledAnneal, simulatedAnneal
+from solvers.compiledAnneal_nb import anneal_chains_nb
+import perturbers.singlePointMover as spm
+
+TIME = 1.0
+
+
+def make_path(dem, n=15):
+    path = xyzPath(dem)
+    for x, y in np.linspace((10, 30), (185, 160), n).tolist():
+        path.add_point(x, y)
+    return path
+
+
+def make_cost():
+    """acsm_equation bound to TIME, with the attributes the viewer's cost wrapper adds."""
+    def cost_fn(path):
+        return acsm_equation(path, TIME)
+    cost_fn.span = acsm_equation.span
+    cost_fn.time = TIME
+    return cost_fn
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="the compiled loop needs Numba")
+@pytest.mark.parametrize("chains", [1, 4])
+def test_compiled_run(dem, monkeypatch, chains):
+    monkeypatch.setattr(compiledAnneal, 'MAX_ITERS', 20000)
+    np.random.seed(0)
+    path = make_path(dem)
+    cost_fn = make_cost()
+    start = path.get_points().copy()
+    calls = []
+    best_path, best_cost = compiledAnneal.optimize(path, cost_fn, [spm], chains=chains,
+                                                   callback=lambda p, c, i: calls.append(i))
+    assert calls
+    assert best_path.get_point_count() == path.get_point_count()
+    # endpoints never move, and the input path is left alone
+    np.testing.assert_array_equal(best_path.get_points()[[0, -1]], start[[0, -1]])
+    np.testing.assert_array_equal(path.get_points(), start)
+    assert best_cost == cost_fn(best_path)
+    assert best_cost <= cost_fn(path)
+
+
+def test_falls_back_without_numba(dem, monkeypatch):
+    monkeypatch.setattr(compiledAnneal, 'NUMBA_AVAILABLE', False)
+    fallback = []
+    optimize = simulatedAnneal.optimize
+
+    def spy(*args, **kwargs):
+        fallback.append(True)
+        return optimize(*args, **kwargs)
+    monkeypatch.setattr(simulatedAnneal, 'optimize', spy)
+    np.random.seed(0)
+    path = make_path(dem)
+    cost_fn = make_cost()
+    best_path, best_cost = compiledAnneal.optimize(path, cost_fn, [spm], chains=4)
+    assert fallback
+    assert best_cost == pytest.approx(cost_fn(best_path))
+    assert best_cost <= cost_fn(path)
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="the compiled loop needs Numba")
+def test_chain_k_is_seeded_with_base_seed_plus_k(dem):
+    start = make_path(dem).get_points()
+
+    def run(base_seed):
+        points = np.repeat(start[None], 4, axis=0)
+        thresholds = np.full((4, 2000), 5.0)
+        anneal_chains_nb(points, points.copy(), dem.get_array(), 1, TIME, np.zeros((4, 2)), np.full(4, 3.0),
+                         thresholds, np.zeros(1, dtype=np.uint8), base_seed)
+        return points
+
+    a, b = run(7), run(8)
+    np.testing.assert_array_equal(a, run(7))
+    assert not np.array_equal(a[0], a[1])
+    np.testing.assert_array_equal(a[1:], b[:-1])
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+import cost_functions
+from cost_functions import acsm_equation, ihc, re3
+from path import xyzPath
+
+COSTS = [re3, acsm_equation, ihc]
+TIME = 1.5
+
+
+def make_path(dem, n=30, seed=0):
+    rng = np.random.default_rng(seed)
+    path = xyzPath(dem)
+    for x, y in rng.uniform(5, 195, size=(n, 2)).tolist():
+        path.add_point(x, y)
+    return path
+
+
+@pytest.mark.parametrize("cost", COSTS)
+@pytest.mark.parametrize("index", [0, 1, 14, 28, 29])
+def test_delta_matches_full_cost(dem, cost, index):
+    old = make_path(dem)
+    new = old.shallow_copy()
+    new.shift_point(index, 3.5, -2.25)
+    old_cost = cost(old, TIME)
+    assert cost.delta(old, new, index, old_cost, TIME) == pytest.approx(cost(new, TIME), rel=1e-9, abs=1e-9)
+
+
+@pytest.mark.parametrize("cost", COSTS)
+def test_span_over_all_segments_differs_from_full_cost_by_a_constant(dem, cost):
+    # the span is the per-segment part; the rest depends only on time and the segment count
+    a, b = make_path(dem, seed=1), make_path(dem, seed=2)
+    n = a.get_point_count()
+    diff_full = cost(a, TIME) - cost(b, TIME)
+    diff_span = cost.span(a.get_points(), 0, n - 1, TIME) - cost.span(b.get_points(), 0, n - 1, TIME)
+    assert diff_span == pytest.approx(diff_full, rel=1e-9, abs=1e-9)
+
+
+@pytest.mark.parametrize("cost", COSTS)
+def test_batch_matches_full_cost(dem, cost):
+    if not hasattr(cost, 'batch'):
+        pytest.skip("batch pricing is only offered when compiled")
+    paths = [make_path(dem, seed=s) for s in range(5)]
+    cands = np.stack([p.get_points() for p in paths])
+    np.testing.assert_allclose(cost.batch(cands, TIME), [cost(p, TIME) for p in paths], rtol=1e-9)
+
+
+@pytest.mark.parametrize("cost", COSTS)
+def test_numpy_fallback_matches_compiled_cost(dem, cost, monkeypatch):
+    path = make_path(dem)
+    compiled = cost(path, TIME)
+    monkeypatch.setattr(cost_functions, 'NUMBA_AVAILABLE', False)
+    assert cost(path, TIME) == pytest.approx(compiled, rel=1e-6)
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from path import xyzPath
+
+# Fixed path used by the baseline comparisons: a straight, evenly climbing
+# start, two clusters of close points and a long last segment
+PTS = [(0, 0, 10), (10, 0, 12), (20, 0, 14), (30, 5, 13), (33, 6, 13.5), (35, 6.5, 14),
+       (60, 20, 5), (61, 21, 6), (90, 40, 0)]
+
+
+def make_path(dem=None, locked=False):
+    path = xyzPath(dem)
+    for x, y, z in PTS:
+        path.add_point(x, y, z)
+    path.locked = locked
+    return path
+
+
+def full_segments(path):
+    """get_segments() of a fresh copy of `path`'s points, computed from scratch."""
+    fresh = xyzPath(path.dem)
+    fresh.points = path.get_points()
+    return fresh.get_segments()
+
+
+MUTATIONS = {
+    'assign points': lambda p: setattr(p, 'points', p.get_points() + 1),
+    'assign_points': lambda p: p.assign_points(p.get_points()[::-1]),
+    'adopt_points': lambda p: p.adopt_points(p.get_points().copy()),
+    'add_point': lambda p: p.add_point(5, 5, 1),
+    'delete_point': lambda p: p.delete_point(3),
+    'shift_point': lambda p: p.shift_point(3, 1.5, -2.0, update_z=False),
+    'shift_points': lambda p: p.shift_points([2, 3, 4], 1.5, -2.0, update_z=False),
+    'update_z_values': lambda p: p.update_z_values(),
+    'clear': lambda p: p.clear(),
+    'consolidate': lambda p: p.consolidate_consecutive_clusters(10),
+}
+
+
+@pytest.mark.parametrize("mutate", MUTATIONS.values(), ids=MUTATIONS.keys())
+def test_every_mutation_takes_a_new_version(dem, mutate):
+    path = make_path(dem)
+    before = path._version
+    mutate(path)
+    assert path._version != before
+
+
+def test_copies_and_swaps_carry_the_version(dem):
+    path = make_path(dem)
+    copy = path.shallow_copy()
+    assert copy._version == path._version
+
+    other = xyzPath(dem)
+    other.add_point(1, 1, 1)
+    other.copy_from(path)
+    assert other._version == path._version
+    np.testing.assert_array_equal(other.get_points(), path.get_points())
+
+    moved = path.shallow_copy()
+    moved.shift_point(2, 1.0, 1.0, update_z=False)
+    v_path, v_moved = path._version, moved._version
+    path.take_ownership(moved)
+    assert (path._version, moved._version) == (v_moved, v_path)
+    assert path.get_point(2)[:2] == [21.0, 1.0]
+
+
+def test_failed_shift_points_moves_nothing(dem):
+    path = make_path(dem)
+    before = path.get_points().copy()
+    version = path._version
+    with pytest.raises(ValueError):
+        # point 8 would leave the 200 x 200 DEM
+        path.shift_points([1, 8], 150.0, 0.0)
+    np.testing.assert_array_equal(path.get_points(), before)
+    assert path._version == version
+
+
+def test_point_views_are_read_only(dem):
+    path = make_path(dem)
+    with pytest.raises(ValueError):
+        path.get_points()[0, 0] = 1.0
+    with pytest.raises(ValueError):
+        path.points[0, 0] = 1.0
+
+
+@pytest.mark.parametrize("shift", [
+    lambda p: p.shift_point(0, 2.0, 1.0),
+    lambda p: p.shift_point(4, -1.5, 3.0),
+    lambda p: p.shift_point(8, 2.0, -1.0),
+    lambda p: p.shift_points([0, 1, 5], 0.5, 1.5),
+    lambda p: p.shift_points([6, 7, 8], -3.0, 2.0),
+])
+def test_refreshed_segments_match_full_recompute(dem, shift):
+    path = make_path(dem)
+    path.get_segments()  # populate the cache so the move refreshes it in place
+    shift(path)
+    np.testing.assert_array_equal(path.get_segments(), full_segments(path))
+
+
+# consolidate_consecutive_clusters(10) on PTS, from the baseline implementation
+CONSOLIDATED = [[10.0, 0.0, 12.0], [32.666666666666664, 5.833333333333333, 13.5], [60.5, 20.5, 5.5],
+                [90.0, 40.0, 0.0]]
+CONSOLIDATED_DEM = [[10.0, 0.0, 533.2340698242188], [32.666666666666664, 5.833333333333333, 589.2481689453125],
+                    [60.5, 20.5, 340.0482482910156], [90.0, 40.0, 0.0]]
+CONSOLIDATED_LOCKED = [[0.0, 0.0, 10.0], [3.0, 0.0, 10.5], [20.0, 0.0, 14.0],
+                       [32.666666666666664, 5.833333333333333, 13.5], [60.5, 20.5, 5.5], [90.0, 40.0, 0.0]]
+
+
+def test_consolidate_matches_baseline(dem):
+    path = make_path()
+    path.consolidate_consecutive_clusters(10)
+    np.testing.assert_allclose(path.get_points(), CONSOLIDATED, rtol=1e-6)
+
+    path = make_path(dem)
+    path.consolidate_consecutive_clusters(10)
+    np.testing.assert_allclose(path.get_points(), CONSOLIDATED_DEM, rtol=1e-6)
+
+    # a run touching a protected endpoint is kept as it is
+    path = make_path(locked=True)
+    pts = path.get_points().copy()
+    pts[1] = (3, 0, 10.5)
+    path.assign_points(pts)
+    path.consolidate_consecutive_clusters(10)
+    np.testing.assert_allclose(path.get_points(), CONSOLIDATED_LOCKED, rtol=1e-6)
@@ -0,0 +1,39 @@
+import numpy as np
+
+import resegmenter
+from test_path import make_path
+
+# resegment(make_path(), 15) from the baseline implementation. Its per-segment
+# rounding can overshoot the target, here by one point, and that is kept
+RESEGMENTED = [[0.0, 0.0, 10.0], [5.0, 0.0, 11.0], [10.0, 0.0, 12.0], [15.0, 0.0, 13.0], [20.0, 0.0, 14.0],
+               [25.0, 2.5, 13.5], [30.0, 5.0, 13.0], [33.0, 6.0, 13.5], [35.0, 6.5, 14.0],
+               [43.33333206176758, 11.0, 11.0], [51.66666793823242, 15.5, 8.0], [60.0, 20.0, 5.0],
+               [61.0, 21.0, 6.0], [70.66666412353516, 27.33333396911621, 4.0],
+               [80.33333587646484, 33.66666793823242, 2.0], [90.0, 40.0, 0.0]]
+# simplify(make_path()): only the middle point of the straight, evenly
+# climbing start is collinear with its neighbours
+SIMPLIFIED = [[0.0, 0.0, 10.0], [20.0, 0.0, 14.0], [30.0, 5.0, 13.0], [33.0, 6.0, 13.5], [35.0, 6.5, 14.0],
+              [60.0, 20.0, 5.0], [61.0, 21.0, 6.0], [90.0, 40.0, 0.0]]
+
+
+def test_resegment_matches_baseline():
+    path = make_path(locked=True)
+    out = resegmenter.resegment(path, 15)
+    np.testing.assert_allclose(out.get_points(), RESEGMENTED, rtol=1e-6)
+    assert out.locked
+    assert resegmenter.resegment(path, path.get_point_count()) is None
+
+
+def test_simplify_matches_baseline():
+    out = resegmenter.simplify(make_path())
+    np.testing.assert_allclose(out.get_points(), SIMPLIFIED, rtol=1e-6)
+    # the points resegment() interpolated are all collinear with their neighbours
+    out = resegmenter.simplify(resegmenter.resegment(make_path(), 15))
+    np.testing.assert_allclose(out.get_points(), SIMPLIFIED, rtol=1e-6)
+
+
+def test_results_own_their_points():
+    path = make_path()
+    for out in (resegmenter.resegment(path, 15), resegmenter.simplify(path)):
+        out.shift_point(1, 1.0, 1.0, update_z=False)
+    np.testing.assert_array_equal(path.get_points(), np.asarray(make_path().get_points()))
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from path import xyzPath
+from cost_functions import acsm_equation, ihc, re3
+from solvers import simulatedAnneal
+import perturbers.singlePointMover as spm
+
+
+def make_path(dem, n=12):
+    path = xyzPath(dem)
+    for x, y in np.linspace((10, 20), (180, 170), n).tolist():
+        path.add_point(x, y)
+    return path
+
+
+@pytest.mark.parametrize("cost", [re3, acsm_equation, ihc])
+def test_delta_tracked_cost_matches_full_cost(dem, cost):
+    np.random.seed(0)
+    calls = []
+
+    def cost_fn(p):
+        return cost(p, 1.0)
+
+    def delta(old_path, new_path, index, old_cost):
+        calls.append(index)
+        return cost.delta(old_path, new_path, index, old_cost, 1.0)
+    cost_fn.delta = delta
+
+    seen = []
+
+    def callback(best_path, best_cost, iter_count):
+        # best_cost here is the solver's running (delta-tracked) value
+        seen.append((best_cost, cost_fn(best_path)))
+
+    best_path, best_cost = simulatedAnneal.optimize(make_path(dem), cost_fn, [spm], callback=callback)
+    assert calls, "the solver never priced a move incrementally"
+    assert seen
+    for tracked, full in seen:
+        assert tracked == pytest.approx(full, rel=1e-6, abs=1e-6)
+    assert best_cost == pytest.approx(cost_fn(best_path), rel=1e-9)
+
@@ -19,12 +19,22 @@ def make_test_path():
     return path
 
 
+def test_optimize_flat_path():
+    path = make_test_path()
+
+    def cost_fn(p):
+        return acsm_equation(p, 1.0)
+    best_path, best_cost = optimize(path, cost_fn, [spm])
+    assert best_path.get_point_count() >= path.get_point_count()
+    assert best_cost <= cost_fn(path)
+
+
 if __name__ == "__main__":
     path = make_test_path()
     time = 1.0  # Dummy time value
     def cost_fn(p):
         return acsm_equation(p, time)
     print("Initial cost:", cost_fn(path))
-    best_path, best_cost = optimize(path, cost_fn, [spm], single_point_spacing=10.0)
+    best_path, best_cost = optimize(path, cost_fn, [spm])
     print("Optimized cost:", best_cost)
     print("Optimized points:", best_path.get_points())
@@ -1,3 +1,6 @@
+from collections import OrderedDict
+import threading
+
 import numpy as np
 
 class TileCache:
@@ -5,38 +8,65 @@ class TileCache:
         self.dem = dem
         self.tile_size = tile_size
         self.max_cache = max_cache
-        self.cache = {}
-        self.order = []
-
-    def tile_coords(self):
-        tx_max = (self.dem.width + self.tile_size - 1) // self.tile_size
-        ty_max = (self.dem.height + self.tile_size - 1) // self.tile_size
-        for ty in range(ty_max):
-            for tx in range(tx_max):
-                yield tx, ty
-
-    def get_tile(self, tx, ty):
-        key = (tx, ty)
-        if key in self.cache:
-            self.order.remove(key)
-            self.order.append(key)
-            return self.cache[key]
-
-        x0 = tx * self.tile_size
-        y0 = ty * self.tile_size
-        x1 = min(x0 + self.tile_size, self.dem.width)
-        y1 = min(y0 + self.tile_size, self.dem.height)
-
-        data = self.dem.get_window(x0, y0, x1, y1)
+        # LRU: least recently used tile first
+        self.cache = OrderedDict()
+        # Guards `cache`; tiles may be prefetched from a background thread.
+        # The DEM read itself runs outside it so cached hits never wait on I/O
+        self._lock = threading.Lock()
+        # (tx, ty) list per level, built on first use; level 0 up front
+        self._coords = {}
+        self.tile_coords(0)
+
+    def tile_span(self, level=0):
+        """DEM pixels covered by one tile edge at `level` (each level halves the resolution)."""
+        return self.tile_size << level
+
+    def tile_counts(self, level=0):
+        """Number of tiles (across, down) covering the DEM at `level`."""
+        span = self.tile_span(level)
+        return (self.dem.width + span - 1) // span, (self.dem.height + span - 1) // span
+
+    def tile_coords(self, level=0):
+        """Iterator over every (tx, ty) at `level`, row by row."""
+        coords = self._coords.get(level)
+        if coords is None:
+            tx_max, ty_max = self.tile_counts(level)
+            coords = [(tx, ty) for ty in range(ty_max) for tx in range(tx_max)]
+            self._coords[level] = coords
+        return iter(coords)
+
+    def has_tile(self, tx, ty, level=0):
+        """True if tile (tx, ty) at `level` is already cached."""
+        return (tx, ty, level) in self.cache
+
+    def get_tile(self, tx, ty, level=0):
+        key = (tx, ty, level)
+        with self._lock:
+            tile = self.cache.get(key)
+            if tile is not None:
+                self.cache.move_to_end(key)
+                return tile
+
+        span = self.tile_span(level)
+        x0 = tx * span
+        y0 = ty * span
+        x1 = min(x0 + span, self.dem.width)
+        y1 = min(y0 + span, self.dem.height)
+
+        out_shape = None
+        if level > 0:
+            # decimated read: one tile pixel per 2**level DEM pixels
+            step = 1 << level
+            out_shape = (max(1, -(-(y1 - y0) // step)), max(1, -(-(x1 - x0) // step)))
+        data = self.dem.get_window(x0, y0, x1, y1, out_shape=out_shape)
         if data is None or data.size == 0:
             return None
 
         tile = data.astype(np.float32)  # keep float precision
 
-        if len(self.cache) >= self.max_cache:
-            oldest = self.order.pop(0)
-            del self.cache[oldest]
-
-        self.cache[key] = tile
-        self.order.append(key)
+        with self._lock:
+            if key not in self.cache and len(self.cache) >= self.max_cache:
+                self.cache.popitem(last=False)
+            self.cache[key] = tile
+            self.cache.move_to_end(key)
         return tile
@@ -1,30 +1,225 @@
-from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QLabel, QSpinBox, QDoubleSpinBox, QPushButton, QHBoxLayout, QWidget, QComboBox, QVBoxLayout, QCheckBox
-from PySide6.QtCore import Qt, QTimer, QCoreApplication
+from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsItem, QGraphicsPixmapItem, QLabel, QSpinBox, QDoubleSpinBox, QPushButton, QHBoxLayout, QWidget, QComboBox, QVBoxLayout, QCheckBox
+from PySide6.QtCore import Qt, QPointF, QRectF, QTimer, QCoreApplication, QObject, QThread, Signal, Slot
+import os
+import inspect
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 from .tile_renderer import TileRenderer
-from PySide6.QtGui import QPen, QColor, QFont, QBrush, QPixmap, QImage, QPainter
+from PySide6.QtGui import QPen, QColor, QFont, QBrush, QPixmap, QImage, QPainter, QPainterPath, QRegion
+import math
 import numpy as np
 import time
 from resegmenter import Resegmenter
 from plugin_loader import PluginLoader
+from numba_compat import StopFlag
+import perturbers.singlePointMover as spm
+
+# Echo print-label messages to stdout as well (set DEBUG in the environment)
+DEBUG = bool(os.environ.get('DEBUG'))
+
+# Paths with fewer points than this are hit-tested with a plain loop over
+# Python floats, which beats the NumPy index's fixed per-call overhead
+SMALL_PATH_POINTS = 64
+
+
+def _polyline(xy):
+    """QPainterPath through the [x, y] pairs in `xy`, in order."""
+    qp = QPainterPath()
+    qp.moveTo(*xy[0])
+    for x, y in xy[1:]:
+        qp.lineTo(x, y)
+    return qp
+
+
+def _warmup_kernels(dem, path_cls, solver_modules, cost_functions):
+    """
+    Compile (or load from Numba's cache) the kernels a first solver run
+    would otherwise wait for: each solver module's warmup(dem) if it has one,
+    the single-point mover's candidate builders, and every cost function with
+    its delta and batch forms, on a throwaway 4-point path.
+    """
+    for module in solver_modules:
+        warmup = getattr(module, 'warmup', None)
+        if callable(warmup):
+            try:
+                warmup(dem)
+            except Exception as e:
+                print(f"Warmup failed for {getattr(module, 'name', module)}: {e}")
+    try:
+        spm.warmup()
+    except Exception as e:
+        print(f"Warmup failed for {spm.name}: {e}")
+    if path_cls is None:
+        return
+    path = path_cls(dem)
+    path.points = np.array([[0, 0, 0], [1, 1, 0], [2, 0, 0], [3, 1, 0]], dtype=np.float32)
+    for func in cost_functions:
+        # past PluginLoader's last-result memo, which the GUI thread uses
+        plugin_cost = getattr(func, '__wrapped__', func)
+        try:
+            cost = plugin_cost(path, 1.0)
+            if hasattr(func, 'delta'):
+                func.delta(path, path, 1, cost, 1.0)
+            if hasattr(func, 'batch'):
+                func.batch(path.get_points()[None].copy(), 1.0)
+        except Exception as e:
+            print(f"Warmup failed for {getattr(func, '__name__', func)}: {e}")
+
+
+# Point marker colors by position along the path
+POINT_COLORS = {'start': (0, 255, 0), 'mid': (0, 0, 255), 'end': (255, 0, 0)}
+
+
+def _make_point_pixmaps():
+    """
+    Pre-rendered point markers: a 6x6 circle stroked 3 px wide ('start',
+    'mid', 'end') and a 20x20 translucent disc ('glow_start', ...) for the
+    hovered point. One scene unit per pixel, matching the ellipses they replace.
+    """
+    pixmaps = {}
+    for kind, rgb in POINT_COLORS.items():
+        circle = QPixmap(9, 9)
+        circle.fill(Qt.transparent)
+        painter = QPainter(circle)
+        painter.setRenderHint(QPainter.Antialiasing)
+        pen = QPen(QColor(*rgb))
+        pen.setWidth(3)
+        painter.setPen(pen)
+        painter.drawEllipse(1.5, 1.5, 6, 6)
+        painter.end()
+        pixmaps[kind] = circle
+
+        glow = QPixmap(20, 20)
+        glow.fill(Qt.transparent)
+        painter = QPainter(glow)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QBrush(QColor(*rgb, 120)))
+        painter.drawEllipse(0, 0, 20, 20)
+        painter.end()
+        pixmaps['glow_' + kind] = glow
+    return pixmaps
+
+
+class _MarkerLayer(QGraphicsItem):
+    """
+    All of a path's point markers as one scene item: paint() stamps the
+    pre-rendered marker pixmaps at each point inside the exposed rect, so
+    the scene holds a single item however many points the path has.
+
+    Markers scale with the zoom, but zoomed out they never shrink below
+    the footprint of the original 6-unit circle drawn with a 3 px cosmetic
+    pen (6 * scale + 3 device pixels across), so the points stay visible.
+    """
+    HALF = 4.5  # markers are 9x9, centred on their point
+    CIRCLE = 6.0  # scene-unit diameter of the circle the markers replace
+    COSMETIC_PEN = 3.0  # and its pen width in device pixels
+
+    def __init__(self, pixmaps):
+        super().__init__()
+        self._pixmaps = pixmaps
+        self._xy = np.empty((0, 2), dtype=int)
+        self._rect = QRectF()
+        self._half = self.HALF  # half a marker's extent in scene units at the current view scale
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+
+    def _device_size(self, scale):
+        """Marker size in device pixels at view scale `scale`."""
+        return max(2 * self.HALF * scale, self.CIRCLE * scale + self.COSMETIC_PEN)
+
+    def set_view_scale(self, scale):
+        """Resize the markers' scene footprint for a view drawn at `scale` device pixels per unit."""
+        half = self.HALF
+        if scale > 0:
+            half = max(self.HALF, 0.5 * self._device_size(scale) / scale)
+        if half != self._half:
+            self._half = half
+            self._set_rect(self._xy)
+
+    def _set_rect(self, xy):
+        """Bounding rect for markers at `xy`; True if it changed (and a full repaint is queued)."""
+        rect = QRectF()
+        if len(xy):
+            lo = (xy.min(axis=0) - self._half).tolist()
+            hi = (xy.max(axis=0) + self._half).tolist()
+            rect = QRectF(lo[0], lo[1], hi[0] - lo[0], hi[1] - lo[1])
+        if rect == self._rect:
+            return False
+        self.prepareGeometryChange()
+        self._rect = rect
+        self.update()
+        return True
+
+    def set_points(self, xy):
+        """Place the markers at the whole-pixel points `xy` (N, 2), repainting only what moved."""
+        prev = self._xy
+        self._xy = xy
+        if self._set_rect(xy):
+            return
+        if len(prev) != len(xy):
+            # markers change color with their position along the path
+            self.update()
+        else:
+            # same count: just the old and new spots of the moved markers
+            h = self._half
+            for i in np.flatnonzero((xy != prev).any(axis=1)).tolist():
+                for x, y in (prev[i].tolist(), xy[i].tolist()):
+                    self.update(QRectF(x - h, y - h, 2 * h, 2 * h))
+
+    def boundingRect(self):
+        return self._rect
+
+    def paint(self, painter, option, widget=None):
+        xy = self._xy
+        if len(xy) == 0:
+            return
+        r = option.exposedRect
+        h = self._half
+        x, y = xy[:, 0], xy[:, 1]
+        inside = np.flatnonzero((x + h >= r.left()) & (x - h <= r.right())
+                                & (y + h >= r.top()) & (y - h <= r.bottom()))
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)  # markers scale with the zoom
+        pixmaps = self._pixmaps
+        mid = pixmaps['mid']
+        last = len(xy) - 1
+        t = painter.worldTransform()
+        scale = math.hypot(t.m11(), t.m12())
+        size = self._device_size(scale)
+        if size <= 2 * self.HALF * scale:
+            # in index order, so later markers overlap earlier ones as before
+            for i, (px, py) in zip(inside.tolist(), xy[inside].tolist()):
+                # Color by position: green (start), blue (middle), red (end)
+                pixmap = pixmaps['start'] if i == 0 else pixmaps['end'] if i == last else mid
+                painter.drawPixmap(QPointF(px - self.HALF, py - self.HALF), pixmap)
+            return
+        # Zoomed out: stamp each marker at its device position, at the
+        # minimum footprint rather than scaled down with the view
+        pts = xy[inside].astype(np.float64)
+        dev_x = t.m11() * pts[:, 0] + t.m21() * pts[:, 1] + t.dx() - 0.5 * size
+        dev_y = t.m12() * pts[:, 0] + t.m22() * pts[:, 1] + t.dy() - 0.5 * size
+        source = QRectF(mid.rect())
+        painter.save()
+        painter.resetTransform()
+        for i, dx, dy in zip(inside.tolist(), dev_x.tolist(), dev_y.tolist()):
+            pixmap = pixmaps['start'] if i == 0 else pixmaps['end'] if i == last else mid
+            painter.drawPixmap(QRectF(dx, dy, size, size), pixmap, source)
+        painter.restore()
 
 
 class TemporaryPathManager:
     """Manages display of temporary paths with automatic expiration."""
-    def __init__(self, scene, duration_ms=2000, update_interval_ms=50):
+    def __init__(self, scene, duration_ms=2000):
         self.scene = scene
         self.duration_ms = duration_ms
-        self.update_interval_ms = update_interval_ms
-        self.temporary_paths = []
-        self.timer = QTimer()
-        self.timer.timeout.connect(self._update)
+        # paths currently on screen; each expires via its own single-shot timer
+        self.active_count = 0
     
     def add_path(self, path, duration_ms=None):
         """Add a path to display temporarily."""
         if duration_ms is None:
             duration_ms = self.duration_ms
         
-        expiry_time = time.time() * 1000 + duration_ms
         graphics_items = []
         points = path.get_points()
         
@@ -33,44 +228,92 @@ class TemporaryPathManager:
             pen.setCosmetic(True)
             pen.setWidth(3)
             
-            for i in range(len(points) - 1):
-                p1, p2 = points[i], points[i + 1]
-                line = self.scene.addLine(float(p1[0]), float(p1[1]), float(p2[0]), float(p2[1]), pen)
-                line.setZValue(1)
-                graphics_items.append(line)
-        
-        self.temporary_paths.append({
-            'path': path,
-            'expiry_time': expiry_time,
-            'items': graphics_items
-        })
-        
-        if not self.timer.isActive():
-            self.timer.start(self.update_interval_ms)
-    
-    def _update(self):
-        """Remove expired paths."""
-        current_time = time.time() * 1000
-        paths_to_keep = []
-        
-        for temp_path_info in self.temporary_paths:
-            if current_time < temp_path_info['expiry_time']:
-                paths_to_keep.append(temp_path_info)
-            else:
-                for item in temp_path_info['items']:
-                    self.scene.removeItem(item)
-        
-        self.temporary_paths = paths_to_keep
+            # one polyline item for the whole path rather than one item per segment
+            line = self.scene.addPath(_polyline(points[:, :2].tolist()), pen)
+            line.setZValue(1)
+            graphics_items.append(line)
         
-        if not self.temporary_paths:
-            self.timer.stop()
+        self.active_count += 1
+        QTimer.singleShot(int(duration_ms), lambda items=graphics_items: self._remove_items(items))
+    
+    def _remove_items(self, items):
+        """Remove one expired path's items from the scene."""
+        for item in items:
+            if item.scene() is self.scene:
+                self.scene.removeItem(item)
+        self.active_count -= 1
     
     def is_active(self):
-        return len(self.temporary_paths) > 0
+        return self.active_count > 0
+
+
+class SolverWorker(QObject):
+    """
+    Runs a solver's optimize() on a QThread so the GUI stays responsive.
+
+    Results come back through the progress/finished signals, which are queued
+    to the GUI thread; the worker never touches the scene itself. Set
+    `live_update` from the GUI to turn progress reports on or off mid-run.
+    """
+    # (best_path, best_cost, iter_count)
+    progress = Signal(object, float, int)
+    # (best_path, best_cost); best_path is None if the solver raised
+    finished = Signal(object, float)
+
+    # Progress is reported only after both PROGRESS_STRIDE iterations and
+    # PROGRESS_INTERVAL seconds, so a fast solver can't flood the GUI queue
+    PROGRESS_INTERVAL = 0.05
+    PROGRESS_STRIDE = 50
+
+    def __init__(self, solver_module, path, cost_function, perturbers, stop_event=None, live_update=True,
+                 options=None):
+        super().__init__()
+        self.solver_module = solver_module
+        self.path = path
+        self.cost_function = cost_function
+        self.perturbers = perturbers
+        self.stop_event = stop_event
+        self.live_update = live_update
+        # extra keyword arguments for this solver's optimize(), e.g. chains
+        self.options = options or {}
+        self._last_progress = 0.0
+        self._last_progress_iter = 0
+
+    def _on_progress(self, best_path, best_cost, iter_count):
+        if not self.live_update:
+            return
+        if iter_count - self._last_progress_iter < self.PROGRESS_STRIDE:
+            return
+        now = time.monotonic()
+        if now - self._last_progress < self.PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        self._last_progress_iter = iter_count
+        self.progress.emit(best_path, float(best_cost), int(iter_count))
+
+    @Slot()
+    def run(self):
+        try:
+            best_path, best_cost = self.solver_module.optimize(
+                self.path,
+                self.cost_function,
+                self.perturbers,
+                callback=self._on_progress,
+                stop_event=self.stop_event,
+                **self.options
+            )
+        except Exception as e:
+            print(f"Solver error: {e}")
+            best_path, best_cost = None, float('inf')
+        self.finished.emit(best_path, float(best_cost))
 
 
 class BlurredPanel(QWidget):
     """Custom widget that draws a semi-transparent background"""
+    # Alpha of the black veil over the panel. Opaque backgrounds from
+    # DEMViewer._create_gradient_background() come with it already blended in
+    OVERLAY_ALPHA = 120
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.background_pixmap = None
@@ -83,11 +326,13 @@ class BlurredPanel(QWidget):
         painter = QPainter(self)
         
         if self.background_pixmap and not self.background_pixmap.isNull():
-            # Draw the blurred background
+            # Draw the blurred background: opaque, with the overlay precomposited,
+            # so a plain copy with no blending and no second pass
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
             painter.drawPixmap(0, 0, self.width(), self.height(), self.background_pixmap)
-        
-        # Draw semi-transparent overlay
-        painter.fillRect(self.rect(), QColor(0, 0, 0, 120))
+        else:
+            # Draw semi-transparent overlay
+            painter.fillRect(self.rect(), QColor(0, 0, 0, self.OVERLAY_ALPHA))
         painter.end()
 
 
@@ -98,8 +343,29 @@ class DEMViewer(QGraphicsView):
         self.tile_cache = tile_cache
         self.path = path
         self.scene = QGraphicsScene()
+        # Tiles are painted in drawBackground() rather than held as items, so
+        # fix the scroll range to the whole DEM instead of the items' bounds
+        self.scene.setSceneRect(0, 0, dem.width, dem.height)
         self.setScene(self.scene)
-        self.tiles_items = {}
+        # Repaint only the regions that changed. The scene holds just a few
+        # persistent path/marker items, updated in place and moved on every
+        # drag frame, so a BSP index would cost more to maintain than it saves
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
+        self.setOptimizationFlag(QGraphicsView.DontAdjustForAntialiasing, True)
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+        # DEM tiles are painted by drawBackground() rather than held as items;
+        # the view keeps the painted background and just shifts it on scroll
+        self.setCacheMode(QGraphicsView.CacheBackground)
+        # Panel gradient pixmaps (one column wide) by (height, invert)
+        self._gradient_cache = {}
+        self.tile_level = 0  # 0 = full resolution, each level halves it
+        # Loads the ring of tiles just outside the viewport into tile_cache in
+        # the background, so the next pan usually finds them cached. One worker:
+        # DEM reads are serialized anyway. Keys queued but not yet loaded are
+        # in _prefetch_pending so repaints don't queue them twice
+        self._prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tile-prefetch")
+        self._prefetch_pending = set()
         self.scale_factor = 1.15  # base zoom factor
 
         # Track cumulative zoom
@@ -109,52 +375,143 @@ class DEMViewer(QGraphicsView):
         self.min_scale = 0.01
         self.max_scale = 100
         
-        # Path visualization
-        self.path_points_items = []
+        # Path visualization: one persistent polyline item and one marker layer,
+        # updated in place by redraw_path()
+        self._segment_item = None
+        self._marker_layer = None
+        self._point_pixmaps = _make_point_pixmaps()
+        # segment pens for edit and fixed mode, built once; _segment_editing
+        # records which of them the segment item currently has
+        self._segment_pens = {}
+        for editing, color in ((True, QColor(100, 150, 255)), (False, QColor(50, 50, 80))):
+            pen = QPen(color)
+            pen.setCosmetic(True)
+            pen.setWidth(2)
+            self._segment_pens[editing] = pen
+        self._segment_editing = None
+        # Hover glow: one persistent item moved between points by _update_glow,
+        # above the segments and below the markers
+        self._glow_item = QGraphicsPixmapItem()
+        self._glow_item.setTransformationMode(Qt.SmoothTransformation)
+        self._glow_item.setZValue(1.5)
+        self._glow_item.setVisible(False)
+        self.scene.addItem(self._glow_item)
         self.path_is_editing = True  # Start in edit mode
         self.dragging_point_index = None  # Track which point is being dragged
         self.dragging_point_indices = []  # Track clustered points being dragged
+        # Drags move points on every mouse event but refresh the view (and
+        # re-run the cost function) at most once per ~frame via this timer
+        self._update_pending_timer = QTimer(self)
+        self._update_pending_timer.setSingleShot(True)
+        self._update_pending_timer.setInterval(16)
+        # Likewise the print label shows the latest message at most every 50 ms
+        self._pending_msg = None
+        self._msg_timer = QTimer(self)
+        self._msg_timer.setSingleShot(True)
+        self._msg_timer.setInterval(50)
+        self._msg_timer.timeout.connect(self._flush_msg)
+        self._update_pending_timer.timeout.connect(self._do_update_all)
+        # and a drag-resize lays out the overlay at most once per ~frame;
+        # the layout reads widget size hints from _hints, refilled by _hint()
+        # only after a widget's contents change
+        self._hints = {}
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(16)
+        self._resize_timer.timeout.connect(self._layout_overlay)
+        # Solver progress reports queued while the GUI thread was busy are
+        # drawn once per ~frame: only the latest (path, cost, iter) is kept
+        self._pending_progress = None
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(16)
+        self._progress_timer.timeout.connect(self._flush_progress)
+        
+        # Points view from _points() and the hit-test index (float64 x/y
+        # sorted by x, and the point index of each row; or, for small paths,
+        # the x/y as a list), each keyed on (id(path), path._version) so any
+        # path mutation invalidates them
+        self._points_cache = None
+        self._points_key = None
+        self._hit_xy = None
+        self._hit_order = None
+        self._hit_list = None
+        self._hit_xy_key = None
+        # scene units per screen pixel, keyed on the view transform's linear part
+        self._scene_per_screen_px = None
+        self._scene_per_screen_key = None
+        
+        # calculate_cost() results, LRU by (path._version, cost name, time). The
+        # stamp changes on every edit, so revisited spinbox values on an
+        # unchanged path are free
+        self._cost_cache = OrderedDict()
+        self._cost_cache_size = 64
         
         # Point selection settings
         self.point_select_radius_screen = 5  # pixels on screen from cursor to select a point
         self.hovered_point_index = None  # Track which point is under cursor
+        # (scene x, scene y, select radius, path stamp) of the last hover test
+        self._last_hover_key = None
         self.point_graphics_items = {}  # Map point index to graphics item for glow effect
         
         # Middle-click pan tracking
         self.middle_click_drag = False
         self.last_pan_pos = None
         
-        # Load plugins
-        self.solvers = PluginLoader.load_solvers()
-        self.cost_functions = PluginLoader.load_cost_functions()
+        # Plugins are imported by _load_plugins() once the viewer is first shown
+        self.solvers = {}
+        self.cost_functions = {}
+        self._plugins_loaded = False
         self.selected_cost_function = None
+        self._active_cost_callable = None  # resolved from selected_cost_function by _set_active_cost
         self.selected_solver = None
+        # resolved from selected_solver by on_solver_selected, with whether its optimize() takes `chains`
+        self._active_solver_module = None
+        self._active_solver_chains = False
         self.current_cost = None
         # Solver run state
         self.solver_running = False
         self.solver_stop_event = None
+        # Worker and its QThread while a solver is running
+        self._solver_worker = None
+        self._solver_thread = None
+        self._solver_initial_cost = None
+        app = QCoreApplication.instance()
+        if app is not None:
+            # the viewer is usually a central widget and never sees closeEvent itself
+            app.aboutToQuit.connect(self.stop_solver)
+            app.aboutToQuit.connect(self._stop_prefetch)
         
         # Temporary path visualization system
         self.temporary_path_manager = TemporaryPathManager(self.scene, duration_ms=2000)
         
+        # All panels and controls live in one overlay above the viewport, so a
+        # single raise_() keeps them on top. Siblings stack in creation order
+        # (each panel before the widgets on it) and the overlay's mask, set in
+        # _update_overlay_mask(), lets mouse events elsewhere reach the scene
+        self.overlay = QWidget(self)
+        self.overlay.setAttribute(Qt.WA_TransparentForMouseEvents, False)
+        
         # Top panel with blur effect (backing for all top widgets)
-        self.top_panel = BlurredPanel(self)
+        self.top_panel = BlurredPanel(self.overlay)
         self.top_panel_height = 100
         
         # Stats label (top left, inside top panel)
-        self.stats_label = QLabel(self)
+        self.stats_label = QLabel(self.overlay)
         self.stats_label.setStyleSheet("color: white; padding: 5px; font-size: 12px; font-family: monospace; background-color: transparent;")
         self.stats_label.setGeometry(10, 10, 300, 80)
         
         # Solver dropdown (top left, right of stats)
-        self.solver_widget = QWidget(self)
+        self.solver_widget = QWidget(self.overlay)
         self.solver_layout = QHBoxLayout(self.solver_widget)
         self.solver_layout.setContentsMargins(5, 5, 5, 5)
         
         self.solver_label = QLabel("Solver:")
         self.solver_label.setStyleSheet("color: white; background-color: transparent;")
         self.solver_combo = QComboBox()
-        self.solver_combo.addItems(sorted(self.solvers.keys()))
+        self.solver_combo.setPlaceholderText("Loading...")
+        # filled after the first show, so size to the items, not the placeholder
+        self.solver_combo.setSizeAdjustPolicy(QComboBox.AdjustToContents)
         self.solver_combo.currentTextChanged.connect(self.on_solver_selected)
         self.solver_combo.setStyleSheet("color: white; background-color: rgba(30, 30, 30, 200); border: 1px solid white; padding: 4px;")
         self.solver_combo.view().setMinimumWidth(200)
@@ -164,15 +521,16 @@ class DEMViewer(QGraphicsView):
         self.solver_widget.setStyleSheet("background-color: transparent;")
         
         # Cost function dropdown and display (top right)
-        self.cost_widget = QWidget(self)
+        self.cost_widget = QWidget(self.overlay)
         self.cost_layout = QHBoxLayout(self.cost_widget)
         self.cost_layout.setContentsMargins(5, 5, 5, 5)
         
         self.cost_label = QLabel("Cost Function:")
         self.cost_label.setStyleSheet("color: white; background-color: transparent;")
         self.cost_combo = QComboBox()
-        self.cost_combo.addItems(sorted(self.cost_functions.keys()))
-        self.cost_combo.currentTextChanged.connect(lambda name: self.calculate_cost(name))
+        self.cost_combo.setPlaceholderText("Loading...")
+        self.cost_combo.setSizeAdjustPolicy(QComboBox.AdjustToContents)
+        self.cost_combo.currentTextChanged.connect(self._set_active_cost)
 
         self.cost_combo.setStyleSheet("color: white; background-color: rgba(30, 30, 30, 200); border: 1px solid white; padding: 4px;")
         self.cost_combo.view().setMinimumWidth(250)
@@ -180,7 +538,7 @@ class DEMViewer(QGraphicsView):
         self.cost_combo.setFocusPolicy(Qt.StrongFocus)
         
         # Cost display label (to the right of cost combo)
-        self.cost_display_label = QLabel(self)
+        self.cost_display_label = QLabel(self.overlay)
         self.cost_display_label.setStyleSheet("color: white; padding: 5px; font-size: 12px; font-family: monospace; background-color: transparent;")
         self.cost_display_label.setMinimumWidth(120)
         self.update_cost_display()
@@ -192,7 +550,7 @@ class DEMViewer(QGraphicsView):
         self.cost_widget.setStyleSheet("background-color: transparent;")
         
         # Available time input (top right, below cost function)
-        self.time_widget = QWidget(self)
+        self.time_widget = QWidget(self.overlay)
         self.time_layout = QHBoxLayout(self.time_widget)
         self.time_layout.setContentsMargins(5, 5, 5, 5)
         
@@ -205,7 +563,7 @@ class DEMViewer(QGraphicsView):
         self.time_spinbox.setSingleStep(0.5)
         self.time_spinbox.setDecimals(2)
         self.time_spinbox.setStyleSheet("color: white; background-color: rgba(0, 0, 0, 180);")
-        self.time_spinbox.valueChanged.connect(lambda _: self.calculate_cost(self.cost_combo.currentText()))
+        self.time_spinbox.valueChanged.connect(lambda _: self.calculate_cost())
 
         
         self.time_layout.addWidget(self.time_label)
@@ -213,8 +571,72 @@ class DEMViewer(QGraphicsView):
         
         self.time_widget.setStyleSheet("background-color: transparent;")
         
+        # Bottom panel widgets (resegment, run solver, messages) are built on
+        # first show by _build_bottom_panel()
+        self.bottom_panel_height = 60
+        self._bottom_built = False
+
+        self.render_tiles()
+        
+        # Disable default drag mode so we can handle panning manually
+        self.setDragMode(QGraphicsView.NoDrag)
+        # Enable mouse tracking to get mouseMoveEvent even when no buttons are pressed
+        self.setMouseTracking(True)
+        self.update_stats()
+        
+        # Raise the overlay (and everything on it) above the scene
+        self.overlay.raise_()
+    
+    def _load_plugins(self):
+        """Import the solver and cost plugins and fill the combos; deferred from __init__ until after the first paint."""
+        if self._plugins_loaded:
+            return
+        self._plugins_loaded = True
+        self.solvers = PluginLoader.load_solvers()
+        self.cost_functions = PluginLoader.load_cost_functions()
+        for combo, names in ((self.solver_combo, self.solvers), (self.cost_combo, self.cost_functions)):
+            # the placeholder keeps the index at -1; select the first item
+            # quietly and run the selection handlers explicitly below
+            combo.blockSignals(True)
+            combo.addItems(sorted(names.keys()))
+            combo.setCurrentIndex(0 if names else -1)
+            combo.blockSignals(False)
+        
+        # Trigger initial selection now that the combos are filled
+        if self.solver_combo.count() > 0:
+            self.on_solver_selected(self.solver_combo.itemText(0))
+        if self.cost_combo.count() > 0:
+            self._set_active_cost(self.cost_combo.currentText())
+        # the combos grew past the placeholder width: drop the cached hints
+        # of the widgets holding them and lay the overlay out again
+        self._hints.pop(self.solver_widget, None)
+        self._hints.pop(self.cost_widget, None)
+        self._layout_overlay()
+        
+        # Compile solver kernels off the GUI thread shortly after startup,
+        # so the first Run click doesn't wait for them
+        QTimer.singleShot(100, self._warmup_solver)
+    
+    def _warmup_solver(self):
+        threading.Thread(
+            target=_warmup_kernels,
+            args=(self.dem, self.path.__class__ if self.path is not None else None,
+                  list(self.solvers.values()), list(self.cost_functions.values())),
+            name="kernel-warmup",
+            daemon=True,
+        ).start()
+
+    def _build_bottom_panel(self):
+        """Create the bottom panel widgets; deferred from __init__ until the viewer is first shown."""
+        if self._bottom_built:
+            return
+        self._bottom_built = True
+        
+        # Bottom panel with gradient background, created first so it stacks under its widgets
+        self.bottom_panel = BlurredPanel(self.overlay)
+        
         # Resegment controls (bottom right)
-        self.resegment_widget = QWidget(self)
+        self.resegment_widget = QWidget(self.overlay)
         self.resegment_layout = QHBoxLayout(self.resegment_widget)
         self.resegment_layout.setContentsMargins(5, 5, 5, 5)
         
@@ -241,7 +663,7 @@ class DEMViewer(QGraphicsView):
         self.resegment_widget.setGeometry(0, 0, 400, 40)
         
         # Solver run button (bottom center)
-        self.run_solver_widget = QWidget(self)
+        self.run_solver_widget = QWidget(self.overlay)
         self.run_solver_layout = QHBoxLayout(self.run_solver_widget)
         self.run_solver_layout.setContentsMargins(5, 5, 5, 5)
         
@@ -250,65 +672,54 @@ class DEMViewer(QGraphicsView):
         self.live_update_checkbox.setChecked(True)
         self.live_update_checkbox.setStyleSheet("color: white; background-color: transparent;")
         
+        # Independent chains for solvers whose optimize() takes `chains`
+        self.chains_label = QLabel("Chains:")
+        self.chains_label.setStyleSheet("color: white; background-color: transparent;")
+        self.chains_spinbox = QSpinBox()
+        self.chains_spinbox.setMinimum(1)
+        self.chains_spinbox.setMaximum(64)
+        self.chains_spinbox.setValue(1)
+        self.chains_spinbox.setStyleSheet("color: white; background-color: rgba(0, 0, 0, 180);")
+        
         self.run_solver_button = QPushButton()
         self.run_solver_button.setStyleSheet("color: white; background-color: rgba(50, 50, 150, 200); padding: 8px; font-weight: bold;")
         self.run_solver_button.clicked.connect(self.on_run_solver)
         self.update_run_button()
+        self._update_chains_control()
         
         self.run_solver_layout.addStretch()
         self.run_solver_layout.addWidget(self.live_update_checkbox)
+        self.run_solver_layout.addWidget(self.chains_label)
+        self.run_solver_layout.addWidget(self.chains_spinbox)
         self.run_solver_layout.addWidget(self.run_solver_button)
         self.run_solver_layout.addStretch()
         
         self.run_solver_widget.setStyleSheet("background-color: transparent;")
         
-        # Bottom panel with gradient background
-        self.bottom_panel = BlurredPanel(self)
-        self.bottom_panel_height = 60
-        
         # Print message label (bottom left)
-        self.print_label = QLabel(self)
+        self.print_label = QLabel(self.overlay)
         self.print_label.setStyleSheet("color: yellow; padding: 5px; font-size: 11px; font-family: monospace; background-color: transparent;")
         self.print_label.setText("")
         self.print_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-
-        self.render_tiles()
-        
-        # Disable default drag mode so we can handle panning manually
-        self.setDragMode(QGraphicsView.NoDrag)
-        # Enable mouse tracking to get mouseMoveEvent even when no buttons are pressed
-        self.setMouseTracking(True)
-        self.update_stats()
         
-        # Show and raise all widgets to ensure they're visible above scene
-        self.top_panel.show()
-        self.stats_label.show()
-        self.solver_widget.show()
-        self.cost_widget.show()
-        self.time_widget.show()
-        self.cost_display_label.show()
+        # the overlay may already be visible, and children added later start hidden
         self.bottom_panel.show()
         self.print_label.show()
         self.resegment_widget.show()
         self.run_solver_widget.show()
         
-        # Raise widgets above scene
-        self.top_panel.raise_()
-        self.stats_label.raise_()
-        self.solver_widget.raise_()
-        self.cost_widget.raise_()
-        self.time_widget.raise_()
-        self.cost_display_label.raise_()
-        self.bottom_panel.raise_()
-        self.print_label.raise_()
-        self.resegment_widget.raise_()
-        self.run_solver_widget.raise_()
-        
-        # Trigger initial selection after all widgets are ready
-        if self.solver_combo.count() > 0:
-            self.on_solver_selected(self.solver_combo.itemText(0))
-        if self.cost_combo.count() > 0:
-            self.calculate_cost(self.cost_combo.currentText())
+        self._position_bottom_widgets()
+        self._flush_msg()
+    
+    def showEvent(self, event):
+        if not self._bottom_built:
+            self._build_bottom_panel()
+            # lay out now rather than a frame later, so the first paint has the controls in place
+            self._layout_overlay()
+        if not self._plugins_loaded:
+            # after this first paint rather than before it
+            QTimer.singleShot(0, self._load_plugins)
+        super().showEvent(event)
 
     def blur_background(self):
         """Create a gradient background for the top panel"""
@@ -319,57 +730,160 @@ class DEMViewer(QGraphicsView):
         self._create_gradient_background(self.bottom_panel, self.bottom_panel_height, invert=True)
     
     def _create_gradient_background(self, panel, height, invert=False):
-        """Create a simple gradient background pixmap and apply to panel."""
+        """
+        Create a simple vertical gradient pixmap and apply it to panel. The
+        pixmap is a single column (cached per height); BlurredPanel stretches
+        it across the panel width when painting.
+        """
         try:
-            width = int(self.width())
-            if width <= 0 or height <= 0:
+            if height <= 0:
+                return
+            key = (height, invert)
+            pixmap = self._gradient_cache.get(key)
+            if pixmap is not None:
+                if panel.background_pixmap is not pixmap:
+                    panel.set_background(pixmap)
                 return
             
-            # Create gradient array
-            arr = np.zeros((height, width, 4), dtype=np.uint8)
-            for y in range(height):
-                if invert:
-                    # Lighter at top, dark at bottom
-                    shade = int(80 - (y / height) * 50)
-                else:
-                    # Dark at top, lighter at bottom
-                    shade = int(30 + (y / height) * 50)
-                arr[y, :] = [shade, shade, shade, 255]
+            # Create gradient column: one shade per row
+            rows = np.arange(height) / height * 50
+            if invert:
+                # Lighter at top, dark at bottom
+                shades = (80 - rows).astype(np.uint8)
+            else:
+                # Dark at top, lighter at bottom
+                shades = (30 + rows).astype(np.uint8)
+            # the panel's black overlay, blended in once here instead of on every paint
+            shades = np.round(shades * ((255 - BlurredPanel.OVERLAY_ALPHA) / 255)).astype(np.uint8)
+            arr = np.empty((height, 1, 4), dtype=np.uint8)
+            arr[..., :3] = shades[:, None, None]
+            arr[..., 3] = 255
             
-            # Convert to QPixmap and set on panel (no blur)
-            q_img = QImage(bytes(arr), width, height, QImage.Format_RGBA8888)
+            # Convert to QPixmap and set on panel (no blur); fromImage copies the
+            # pixels, so the QImage can wrap arr directly
+            q_img = QImage(arr.data, 1, height, arr.strides[0], QImage.Format_RGBA8888)
             pixmap = QPixmap.fromImage(q_img)
+            self._gradient_cache[key] = pixmap
             panel.set_background(pixmap)
         except Exception as e:
             print(f"Background creation failed: {e}")
 
-    def render_tiles(self):
-        for tx, ty in self.tile_cache.tile_coords():
-            tile = self.tile_cache.get_tile(tx, ty)
-            pixmap = TileRenderer.render(tile)
-            if pixmap is None:
-                continue
-            if (tx, ty) in self.tiles_items:
-                self.scene.removeItem(self.tiles_items[(tx, ty)])
-            item = self.scene.addPixmap(pixmap)
-            item.setPos(tx * self.tile_cache.tile_size, ty * self.tile_cache.tile_size)
-            self.tiles_items[(tx, ty)] = item
+    def render_tiles(self, level=None):
+        if level is not None and level != self.tile_level:
+            self.tile_level = level
+            # repaint the background with the new level's tiles
+            self.resetCachedContent()
+            self.scene.invalidate(self.scene.sceneRect(), QGraphicsScene.BackgroundLayer)
         
         # Refresh blurred background after tiles render
         self.blur_background()
         
-        # Ensure panels stay behind widgets
-        self.top_panel.stackUnder(self.stats_label)
-        self.bottom_panel.stackUnder(self.print_label)
+        # Keep the overlay above the viewport
+        self.overlay.raise_()
+
+    def drawBackground(self, painter, rect):
+        """Paint the current level's tiles that intersect `rect` (scene coordinates)."""
+        super().drawBackground(painter, rect)
+        level = self.tile_level
+        span = self.tile_cache.tile_span(level)
+        scale = 1 << level  # a decimated pixmap covers span scene pixels
+        tiles_x, tiles_y = self.tile_cache.tile_counts(level)
+        tx_min = max(int(rect.left() // span), 0)
+        ty_min = max(int(rect.top() // span), 0)
+        tx_max = min(int(rect.right() // span) + 1, tiles_x)
+        ty_max = min(int(rect.bottom() // span) + 1, tiles_y)
+        for ty in range(ty_min, ty_max):
+            for tx in range(tx_min, tx_max):
+                pixmap = TileRenderer.render_tile(self.tile_cache, tx, ty, level)
+                if pixmap is None:
+                    continue
+                target = QRectF(tx * span, ty * span, pixmap.width() * scale, pixmap.height() * scale)
+                painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+        self._prefetch_ring(level)
+
+    def _prefetch_ring(self, level):
+        """
+        Queue background loads for the tiles one ring outside the viewport at
+        `level` that neither tile_cache nor TileRenderer holds yet.
+        """
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        span = self.tile_cache.tile_span(level)
+        tiles_x, tiles_y = self.tile_cache.tile_counts(level)
+        tx_min = int(visible.left() // span)
+        ty_min = int(visible.top() // span)
+        tx_max = int(visible.right() // span) + 1
+        ty_max = int(visible.bottom() // span) + 1
+        for ty in range(max(ty_min - 1, 0), min(ty_max + 1, tiles_y)):
+            for tx in range(max(tx_min - 1, 0), min(tx_max + 1, tiles_x)):
+                if tx_min <= tx < tx_max and ty_min <= ty < ty_max:
+                    continue  # visible, loaded by the paint itself
+                key = (tx, ty, level)
+                if (key in self._prefetch_pending or self.tile_cache.has_tile(tx, ty, level)
+                        or TileRenderer.has_pixmap(self.tile_cache, tx, ty, level)):
+                    continue
+                self._prefetch_pending.add(key)
+                try:
+                    future = self._prefetcher.submit(self.tile_cache.get_tile, tx, ty, level)
+                except RuntimeError:
+                    return  # shut down on quit
+                future.add_done_callback(lambda f, key=key: self._prefetch_pending.discard(key))
+
+    def _stop_prefetch(self):
+        """Drop queued tile loads so quitting doesn't wait for them."""
+        self._prefetcher.shutdown(wait=False, cancel_futures=True)
+
+    def _points(self):
+        """The path's (n, 3) points view, fetched again only after the path or its contents change."""
+        key = (id(self.path), self.path._version)
+        if self._points_key != key:
+            self._points_cache = self.path.get_points()
+            self._points_key = key
+        return self._points_cache
+
+    def _points_within(self, x, y, radius):
+        """Indices, ascending, of the path points closer than `radius` to scene position (x, y)."""
+        if self.path is None:
+            return np.zeros(0, dtype=np.intp)
+        # points sorted by x, rebuilt only when the path object or its contents
+        # change (not per mouse event); a query then only tests the points in
+        # the x strip [x - radius, x + radius] instead of the whole path
+        key = (id(self.path), self.path._version)
+        if self._hit_xy_key != key:
+            xy = self._points()[:, :2].astype(np.float64)
+            self._hit_list = xy.tolist() if len(xy) < SMALL_PATH_POINTS else None
+            self._hit_order = np.argsort(xy[:, 0], kind='stable')
+            self._hit_xy = xy[self._hit_order]
+            self._hit_xy_key = key
+        if self._hit_list is not None:
+            # same float64 arithmetic as the vectorized test below
+            r2 = radius * radius
+            hits = []
+            for i, (px, py) in enumerate(self._hit_list):
+                dx = px - x
+                dy = py - y
+                if dx * dx + dy * dy < r2:
+                    hits.append(i)
+            return np.array(hits, dtype=np.intp)
+        lo = np.searchsorted(self._hit_xy[:, 0], x - radius, side='left')
+        hi = np.searchsorted(self._hit_xy[:, 0], x + radius, side='right')
+        strip = self._hit_xy[lo:hi]
+        dx = strip[:, 0] - x
+        dy = strip[:, 1] - y
+        return np.sort(self._hit_order[lo:hi][dx * dx + dy * dy < radius * radius])
 
     def screen_to_scene_distance(self, screen_pixels):
         """Convert a distance in screen space to scene space"""
-        # Get two points in screen space separated by screen_pixels
-        p1_screen = self.mapToScene(0, 0)
-        p2_screen = self.mapToScene(screen_pixels, 0)
-        # Calculate the distance in scene space
-        scene_distance = np.sqrt((p2_screen.x() - p1_screen.x())**2 + (p2_screen.y() - p1_screen.y())**2)
-        return scene_distance
+        # The ratio depends only on the view transform's linear part, not on
+        # scrolling, so it is measured once per transform rather than per mouse event
+        t = self.transform()
+        key = (t.m11(), t.m12(), t.m21(), t.m22())
+        if self._scene_per_screen_key != key:
+            # Get two points in screen space one pixel apart
+            p1_screen = self.mapToScene(0, 0)
+            p2_screen = self.mapToScene(1, 0)
+            self._scene_per_screen_px = math.hypot(p2_screen.x() - p1_screen.x(), p2_screen.y() - p1_screen.y())
+            self._scene_per_screen_key = key
+        return screen_pixels * self._scene_per_screen_px
 
     def wheelEvent(self, event):
         """Zoom in/out centered on mouse cursor with min/max scale limits"""
@@ -381,13 +895,17 @@ class DEMViewer(QGraphicsView):
 
         # Compute tentative new cumulative scale
         new_scale = self.current_scale * zoom
-        # Clamp using lightweight np.clip
-        clamped_scale = np.clip(new_scale, self.min_scale, self.max_scale)
+        # Clamp with plain comparisons: np.clip on a scalar goes through the
+        # ufunc machinery (and returns a NumPy scalar) on every wheel tick
+        clamped_scale = float(max(self.min_scale, min(new_scale, self.max_scale)))
         # Adjust zoom factor to account for clamping
         effective_zoom = clamped_scale / self.current_scale
 
         # Zoom around the mouse cursor
         self.scale(effective_zoom, effective_zoom)
+        if self._marker_layer is not None:
+            # zoomed out, markers keep a minimum on-screen size
+            self._marker_layer.set_view_scale(self.transform().m11())
         self.current_scale = clamped_scale
 
         # After zoom, get the new position where the cursor is
@@ -396,6 +914,21 @@ class DEMViewer(QGraphicsView):
         # Pan so the same scene point is under the cursor
         delta = scene_pos - new_scene_pos
         self.translate(delta.x(), delta.y())
+
+        # Zoomed out, switch to decimated tiles (about one tile pixel per screen pixel)
+        level = self._tile_level_for_scale(self.current_scale)
+        if level != self.tile_level:
+            self.render_tiles(level)
+
+    def _tile_level_for_scale(self, scale):
+        """Coarsest tile level whose pixels are still no larger than a screen pixel."""
+        if scale >= 1:
+            return 0
+        level = int(math.floor(math.log2(1 / scale)))
+        # no point going beyond a single tile for the whole DEM
+        longest = max(self.dem.width, self.dem.height)
+        max_level = max(0, int(math.ceil(math.log2(max(longest / self.tile_cache.tile_size, 1)))))
+        return min(level, max_level)
     
     def mousePressEvent(self, event):
         """Handle mouse clicks for adding points to path"""
@@ -409,8 +942,8 @@ class DEMViewer(QGraphicsView):
             return
         
         scene_pos = self.mapToScene(event.pos())
-        x = int(scene_pos.x())
-        y = int(scene_pos.y())
+        x = scene_pos.x()
+        y = scene_pos.y()
         
         # Left click: add point in edit mode, or drag existing point
         if event.button() == Qt.LeftButton:
@@ -424,14 +957,8 @@ class DEMViewer(QGraphicsView):
                 return
             
             # Check if clicking on an existing point (within select radius in screen space)
-            points = self.path.get_points()
             scene_radius = self.screen_to_scene_distance(self.point_select_radius_screen)
-            clicked_indices = []
-            for i, point in enumerate(points):
-                px, py = int(point[0]), int(point[1])
-                dist = np.sqrt((x - px)**2 + (y - py)**2)
-                if dist < scene_radius:
-                    clicked_indices.append(i)
+            clicked_indices = self._points_within(x, y, scene_radius).tolist()
             
             if clicked_indices:
                 # Start dragging the clicked point(s)
@@ -448,7 +975,7 @@ class DEMViewer(QGraphicsView):
         
         # Right click: finalize path (stop editing)
         elif event.button() == Qt.RightButton:
-            if self.path_is_editing and len(self.path.get_points()) > 0:
+            if self.path_is_editing and len(self._points()) > 0:
                 self.path_is_editing = False
                 self.path.locked = True
                 self.update_all()
@@ -468,41 +995,44 @@ class DEMViewer(QGraphicsView):
             return
         
         scene_pos = self.mapToScene(event.pos())
-        x = int(scene_pos.x())
-        y = int(scene_pos.y())
+        x = scene_pos.x()
+        y = scene_pos.y()
         
         # Handle point dragging (including clustered points)
         if self.dragging_point_index is not None and len(self.dragging_point_indices) > 0:
             # Get the primary point's current position
-            primary_point = self.path.points[self.dragging_point_index]
-            dx = x - int(primary_point[0])
-            dy = y - int(primary_point[1])
+            primary_point = self._points()[self.dragging_point_index]
+            dx = x - float(primary_point[0])
+            dy = y - float(primary_point[1])
             
-            # Move all selected points by the same delta
+            # Move all selected points by the same delta, in one vectorized call
             try:
-                for i in self.dragging_point_indices:
-                    self.path.shift_point(i, dx, dy, update_z=True)
-                self.update_all()
+                self.path.shift_points(self.dragging_point_indices, dx, dy, update_z=True)
+                self._schedule_update()
             except (ValueError, IndexError) as e:
                 print(f"Error shifting point: {e}")
         else:
             # Check for hover over points to show glow
             if self.path_is_editing:
-                points = self.path.get_points() if self.path else np.array([]).reshape(0, 3)
+                # first point within the select radius, as for clicks
+                scene_radius = self.screen_to_scene_distance(self.point_select_radius_screen)
+                # Skip the hit test when nothing it depends on changed. Keyed on the
+                # scene position, not the screen one: Qt replays the last screen
+                # position after a scroll, which lands on a different scene point
+                hover_key = (x, y, scene_radius, id(self.path), self.path._version)
+                if hover_key == self._last_hover_key:
+                    super().mouseMoveEvent(event)
+                    return
+                self._last_hover_key = hover_key
                 old_hovered = self.hovered_point_index
                 self.hovered_point_index = None
+                hits = self._points_within(x, y, scene_radius)
+                if len(hits):
+                    self.hovered_point_index = int(hits[0])
                 
-                scene_radius = self.screen_to_scene_distance(self.point_select_radius_screen)
-                for i, point in enumerate(points):
-                    px, py = int(point[0]), int(point[1])
-                    dist = np.sqrt((x - px)**2 + (y - py)**2)
-                    if dist < scene_radius:
-                        self.hovered_point_index = i
-                        break
-                
-                # Redraw if hover state changed (to show/remove glow)
+                # Move/hide the glow if hover state changed; nothing else needs redrawing
                 if old_hovered != self.hovered_point_index:
-                    self.redraw_path()
+                    self._update_glow()
             
             super().mouseMoveEvent(event)
     
@@ -511,6 +1041,10 @@ class DEMViewer(QGraphicsView):
         if event.button() == Qt.LeftButton:
             self.dragging_point_index = None
             self.dragging_point_indices = []
+            if self._update_pending_timer.isActive():
+                # flush the last coalesced drag update so the final state is shown
+                self._update_pending_timer.stop()
+                self._do_update_all()
         elif event.button() == Qt.MiddleButton:
             self.middle_click_drag = False
             self.last_pan_pos = None
@@ -530,65 +1064,63 @@ class DEMViewer(QGraphicsView):
             super().keyPressEvent(event)
     
     def redraw_path(self):
-        """Clear and redraw path points and segments on the scene"""
-        # Remove old point markers and segments
-        for item in self.path_points_items:
-            self.scene.removeItem(item)
-        self.path_points_items.clear()
-        
+        """Bring the path's scene items up to date with the path's points"""
         self._draw_segments()
         if self.path_is_editing:
             self._draw_points()
+        else:
+            self._remove_markers()
+        self._update_glow()
+    
+    def _remove_markers(self):
+        if self._marker_layer is not None:
+            self.scene.removeItem(self._marker_layer)
+            self._marker_layer = None
+    
+    def _update_glow(self):
+        """Show the glow under the hovered point (edit mode only), or hide it."""
+        i = self.hovered_point_index
+        points = self._points() if self.path else None
+        if not self.path_is_editing or i is None or points is None or not 0 <= i < len(points):
+            self._glow_item.setVisible(False)
+            return
+        kind = 'start' if i == 0 else 'end' if i == len(points) - 1 else 'mid'
+        self._glow_item.setPixmap(self._point_pixmaps['glow_' + kind])
+        x, y = points[i, :2].astype(int).tolist()
+        self._glow_item.setOffset(x - 10, y - 10)
+        self._glow_item.setVisible(True)
     
     def _draw_segments(self):
         """Draw line segments connecting path points."""
-        points = self.path.get_points()
+        points = self._points()
         if len(points) < 2:
+            if self._segment_item is not None:
+                self.scene.removeItem(self._segment_item)
+                self._segment_item = None
             return
         
-        line_color = QColor(100, 150, 255) if self.path_is_editing else QColor(50, 50, 80)
-        pen = QPen(line_color)
-        pen.setCosmetic(True)
-        pen.setWidth(2)
-        
-        for i in range(len(points) - 1):
-            x1, y1 = int(points[i][0]), int(points[i][1])
-            x2, y2 = int(points[i + 1][0]), int(points[i + 1][1])
-            line = self.scene.addLine(x1, y1, x2, y2, pen)
-            line.setZValue(1)
-            self.path_points_items.append(line)
+        editing = bool(self.path_is_editing)
+        # one polyline item on whole pixels, rather than one line item per segment;
+        # it stays in the scene and is only given the new outline
+        polyline = _polyline(points[:, :2].astype(int).tolist())
+        if self._segment_item is None:
+            self._segment_item = self.scene.addPath(polyline, self._segment_pens[editing])
+            self._segment_item.setZValue(1)
+        else:
+            self._segment_item.setPath(polyline)
+            if self._segment_editing != editing:
+                self._segment_item.setPen(self._segment_pens[editing])
+        self._segment_editing = editing
     
     def _draw_points(self):
         """Draw point markers (only in edit mode)."""
-        points = self.path.get_points()
-        
-        for i, point in enumerate(points):
-            x, y = int(point[0]), int(point[1])
-            
-            # Color by position: green (start), blue (middle), red (end)
-            if i == 0:
-                color = QColor(0, 255, 0)
-            elif i == len(points) - 1:
-                color = QColor(255, 0, 0)
-            else:
-                color = QColor(0, 0, 255)
-            
-            # Draw glow if hovered
-            if i == self.hovered_point_index:
-                glow_color = QColor(color.red(), color.green(), color.blue(), 120)
-                glow_pen = QPen(Qt.transparent)
-                glow_brush = QBrush(glow_color)
-                glow = self.scene.addEllipse(x - 10, y - 10, 20, 20, glow_pen, glow_brush)
-                glow.setZValue(1)
-                self.path_points_items.append(glow)
-            
-            # Draw point circle
-            pen = QPen(color)
-            pen.setCosmetic(True)
-            pen.setWidth(3)
-            circle = self.scene.addEllipse(x - 3, y - 3, 6, 6, pen)
-            circle.setZValue(2)
-            self.path_points_items.append(circle)
+        if self._marker_layer is None:
+            # one item for every marker (the hover glow is the separate _glow_item)
+            self._marker_layer = _MarkerLayer(self._point_pixmaps)
+            self._marker_layer.setZValue(2)
+            self._marker_layer.set_view_scale(self.transform().m11())
+            self.scene.addItem(self._marker_layer)
+        self._marker_layer.set_points(self._points()[:, :2].astype(int))
     
     def update_stats(self):
         """Update the stats label with path length and elevation gain"""
@@ -614,22 +1146,43 @@ Mode: {'EDIT' if self.path_is_editing else 'FIXED'}"""
         if self.current_cost is not None:
             cost_html = f"Cost: <span style='font-size: 18px;'><b>{self.current_cost:.1f}</b></span>"
             self.cost_display_label.setText(cost_html)
+            self._hints.pop(self.cost_widget, None)
     
     def update_all(self):
         """Update all UI elements: redraw, recalc cost, update stats and display."""
         self.redraw_path()
         self.update_stats()
-        self.calculate_cost(self.cost_combo.currentText())
+        self.calculate_cost()
         self.update_cost_display()
+    
+    def _schedule_update(self):
+        """Request update_all(), coalescing requests that arrive within one timer interval."""
+        if not self._update_pending_timer.isActive():
+            self._update_pending_timer.start()
+    
+    def _do_update_all(self):
+        self.update_all()
 
     
     def add_print_message(self, message):
-        """Add a message to the print label and console"""
-        print(str(message))
-        self.print_label.setText(str(message))
+        """Show a message on the print label (and the console when DEBUG is set)"""
+        message = str(message)
+        if DEBUG:
+            print(message)
+        self._pending_msg = message
+        if not self._msg_timer.isActive():
+            self._msg_timer.start()
+    
+    def _flush_msg(self):
+        if self._pending_msg is not None and self._bottom_built:
+            self.print_label.setText(self._pending_msg)
+            self._pending_msg = None
     
     def update_run_button(self):
         """Update the run solver button text"""
+        if not self._bottom_built:
+            return
+        self._hints.pop(self.run_solver_widget, None)
         if self.solver_running:
             # Running state: show Stop and red
             self.run_solver_button.setText("Stop")
@@ -647,24 +1200,61 @@ Mode: {'EDIT' if self.path_is_editing else 'FIXED'}"""
             self.run_solver_button.setEnabled(False)
     
     def on_solver_selected(self, solver_name):
-        """Handle solver selection"""
+        """Handle solver selection: resolve the module (and its options) once"""
         if solver_name:  # Always true now since blank is gone
             self.selected_solver = solver_name
+            self._active_solver_module = self.solvers.get(solver_name)
+            self._active_solver_chains = self._solver_takes_chains(self._active_solver_module)
             self.update_run_button()
+            self._update_chains_control()
     
-    def calculate_cost(self, func_name):
-        """Handle cost function selection and calculation"""
-        print(func_name)
+    def _solver_takes_chains(self, solver_module):
+        """Whether `solver_module.optimize` accepts a `chains` keyword."""
+        try:
+            return 'chains' in inspect.signature(solver_module.optimize).parameters
+        except (AttributeError, TypeError, ValueError):
+            return False
+    
+    def _update_chains_control(self):
+        """Enable the Chains spinbox only for solvers that can run several chains."""
+        if not self._bottom_built:
+            return
+        self.chains_label.setEnabled(self._active_solver_chains)
+        self.chains_spinbox.setEnabled(self._active_solver_chains)
+    
+    def _set_active_cost(self, func_name):
+        """Handle cost function selection: resolve the plugin once, then recompute"""
         if func_name:  # Always true now since blank is gone
             self.selected_cost_function = func_name
-            cost_func = self.cost_functions.get(func_name)
-            if cost_func and self.path:
-                try:
-                    self.current_cost = cost_func(self.path, self.time_spinbox.value())
-                except Exception as e:
-                    print(f"Error calculating cost: {e}")
-                    self.current_cost = None
+            self._active_cost_callable = self.cost_functions.get(func_name)
+        self.calculate_cost()
+    
+    def calculate_cost(self, func_name=None):
+        """Recalculate the cost of the path with the selected cost function"""
+        if func_name and func_name != self.selected_cost_function:
+            self.selected_cost_function = func_name
+            self._active_cost_callable = self.cost_functions.get(func_name)
+        cost_func = self._active_cost_callable
+        if cost_func is None or self.path is None:
             self.update_cost_display()
+            return
+        time_val = self.time_spinbox.value()
+        key = (self.path._version, self.selected_cost_function, round(time_val, 4))
+        cached = self._cost_cache.get(key)
+        if cached is not None:
+            self._cost_cache.move_to_end(key)
+            self.current_cost = cached
+        else:
+            try:
+                self.current_cost = cost_func(self.path, time_val)
+            except Exception as e:
+                print(f"Error calculating cost: {e}")
+                self.current_cost = None
+            if self.current_cost is not None:
+                self._cost_cache[key] = self.current_cost
+                if len(self._cost_cache) > self._cost_cache_size:
+                    self._cost_cache.popitem(last=False)
+        self.update_cost_display()
     
     def add_temporary_path(self, path, duration_ms=None):
         """Add a path that will be displayed for a short time then removed."""
@@ -686,61 +1276,122 @@ Mode: {'EDIT' if self.path_is_editing else 'FIXED'}"""
 
         self.add_print_message(f"Running solver: {self.selected_solver}")
 
-        solver_module = self.solvers.get(self.selected_solver)
-        cost_func = self.cost_functions.get(self.selected_cost_function)
+        solver_module = self._active_solver_module
+        cost_func = self._active_cost_callable
 
         if not solver_module or not cost_func:
             self.add_print_message("Solver or cost function not found")
             return
 
         # Prepare stop event and set running state
-        self.solver_stop_event = threading.Event()
+        # an Event to the Python solvers; compiled loops poll its flag array directly
+        self.solver_stop_event = StopFlag()
         self.solver_running = True
         self.update_run_button()
 
-        # Run solver synchronously but cooperative: optimize checks stop_event and callbacks process events
         try:
             self._execute_solver(solver_module, cost_func, stop_event=self.solver_stop_event)
-        finally:
-            # Ensure state reset
-            self.solver_running = False
-            self.solver_stop_event = None
-            self.update_run_button()
-    
+        except Exception as e:
+            self.add_print_message(f"Solver failed to start: {e}")
+            self._reset_solver_state()
+
     def _execute_solver(self, solver_module, cost_func, stop_event=None):
-        """Execute the solver with cost function and update path."""
-        import perturbers.singlePointMover as spm
-        
+        """Start the solver on a worker thread; _on_solver_finished applies the result."""
         time_val = self.time_spinbox.value()
         
-        # Wrap cost function to bind time parameter
-        def wrapped_cost(path):
-            try:
-                return cost_func(path, time_val)
-            except Exception as e:
-                print(f"Cost function error: {e}")
-                return float('inf')
-        
-        # Show initial cost
-        initial_cost = wrapped_cost(self.path)
-        self.add_print_message(f"Initial cost: {initial_cost:.2f}")
-        
-        # Define callback for live updates
-        def sa_callback(current_best_path, current_best_cost, iter_count):
-            if self.live_update_checkbox.isChecked():
-                self.add_temporary_path(current_best_path)
-                self.add_print_message(f"Iter {iter_count}: cost = {current_best_cost:.2f}")
-                QCoreApplication.processEvents()
-            # Also allow UI to stop solver: if stop_event set, nothing else needed here
-        
-        # Run simulated annealing
-        best_path, best_cost = solver_module.optimize(
-            self.path,
+        # Validate the cost function once on the current path (usually a memo
+        # hit from calculate_cost); this is also the initial cost shown
+        try:
+            self._solver_initial_cost = cost_func(self.path, time_val)
+            validated = True
+        except Exception as e:
+            print(f"Cost function error: {e}")
+            self._solver_initial_cost = float('inf')
+            validated = False
+        self.add_print_message(f"Initial cost: {self._solver_initial_cost:.2f}")
+        
+        # Wrap cost function to bind time parameter. Every path the solver
+        # prices is new, so skip PluginLoader's last-result memo and bind the
+        # plugin and its delta/batch forms to locals once, not per call.
+        # Once validated, calls go unguarded: a later failure ends the run
+        # with a "Solver error" instead of being scored as inf
+        plugin_cost = getattr(cost_func, '__wrapped__', cost_func)
+        if validated:
+            def wrapped_cost(path):
+                return plugin_cost(path, time_val)
+        else:
+            def wrapped_cost(path):
+                try:
+                    return plugin_cost(path, time_val)
+                except Exception as e:
+                    print(f"Cost function error: {e}")
+                    return float('inf')
+        if hasattr(cost_func, 'delta'):
+            # incremental form for single-point moves, with the same time bound in
+            delta = cost_func.delta
+            wrapped_cost.delta = lambda old_path, new_path, index, old_cost: delta(old_path, new_path, index, old_cost, time_val)
+            if hasattr(cost_func, 'delta_min_points'):
+                wrapped_cost.delta_min_points = cost_func.delta_min_points
+        if hasattr(cost_func, 'batch'):
+            # scores a (k, n, 3) stack of candidate points in one call
+            batch = cost_func.batch
+            wrapped_cost.batch = lambda cands: batch(cands, time_val)
+        if hasattr(cost_func, 'span'):
+            # compiled per-segment kernel and the time to call it with, for compiled solvers
+            wrapped_cost.span = cost_func.span
+            wrapped_cost.time = time_val
+        
+        # The worker gets its own copy so edits made during the run can't race the solver
+        worker = SolverWorker(
+            solver_module,
+            self.path.shallow_copy(),
             wrapped_cost,
             [spm],
-            callback=sa_callback,
-            stop_event=stop_event
+            stop_event=stop_event,
+            live_update=self.live_update_checkbox.isChecked(),
+            options={'chains': self.chains_spinbox.value()} if self._active_solver_chains else None
         )
+        thread = QThread(self)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self._on_solver_progress, Qt.QueuedConnection)
+        worker.finished.connect(self._on_solver_finished, Qt.QueuedConnection)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        self.live_update_checkbox.toggled.connect(self._on_live_update_toggled)
+        
+        self._solver_worker = worker
+        self._solver_thread = thread
+        thread.start()
+    
+    def _on_live_update_toggled(self, checked):
+        if self._solver_worker is not None:
+            self._solver_worker.live_update = checked
+    
+    def _on_solver_progress(self, current_best_path, current_best_cost, iter_count):
+        """Live update from the worker, delivered on the GUI thread."""
+        if not self.solver_running or not self.live_update_checkbox.isChecked():
+            return
+        self._pending_progress = (current_best_path, current_best_cost, iter_count)
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
+    
+    def _flush_progress(self):
+        if self._pending_progress is None or not self.solver_running:
+            return
+        current_best_path, current_best_cost, iter_count = self._pending_progress
+        self._pending_progress = None
+        self.add_temporary_path(current_best_path)
+        self.add_print_message(f"Iter {iter_count}: cost = {current_best_cost:.2f}")
+    
+    def _on_solver_finished(self, best_path, best_cost):
+        """Apply the solver result once the worker is done, on the GUI thread."""
+        initial_cost = self._solver_initial_cost
+        self._reset_solver_state()
+        if best_path is None:
+            self.add_print_message("Solver failed")
+            return
         
         # Update path and display
         self.path = best_path
@@ -750,21 +1401,66 @@ Mode: {'EDIT' if self.path_is_editing else 'FIXED'}"""
         self.update_cost_display()
         self.add_print_message(f"Finished! Cost: {initial_cost:.2f} → {best_cost:.2f}")
     
+    def _reset_solver_state(self):
+        if self._solver_worker is not None:
+            try:
+                self.live_update_checkbox.toggled.disconnect(self._on_live_update_toggled)
+            except (RuntimeError, TypeError):
+                pass
+        self._solver_worker = None
+        self._solver_thread = None
+        self._pending_progress = None
+        self.solver_running = False
+        self.solver_stop_event = None
+        self.update_run_button()
+    
+    def stop_solver(self):
+        """Ask a running solver to stop and wait for its thread to exit."""
+        if self.solver_stop_event:
+            self.solver_stop_event.set()
+        if self._solver_thread is not None:
+            self._solver_thread.quit()
+            self._solver_thread.wait()
+    
+    def closeEvent(self, event):
+        self.stop_solver()
+        super().closeEvent(event)
+    
     def resizeEvent(self, event):
-        """Position UI elements at proper locations"""
+        """Position UI elements at proper locations, once the resize settles for a frame"""
         super().resizeEvent(event)
+        self.overlay.setGeometry(self.rect())
+        self._resize_timer.start()
+    
+    def _layout_overlay(self):
         self._position_panels()
         self._position_top_widgets()
         self._position_bottom_widgets()
+        self._update_overlay_mask()
+    
+    def _hint(self, widget):
+        """widget.sizeHint(), cached in _hints until the widget's contents change."""
+        hint = self._hints.get(widget)
+        if hint is None:
+            hint = self._hints[widget] = widget.sizeHint()
+        return hint
+    
+    def _update_overlay_mask(self):
+        """Limit the overlay to its panels and controls so the rest of the view stays interactive."""
+        region = QRegion()
+        for child in self.overlay.children():
+            if child.isWidgetType() and not child.isHidden():
+                region = region.united(child.geometry())
+        self.overlay.setMask(region)
     
     def _position_panels(self):
         """Position and style background panels."""
         self.top_panel.setGeometry(0, 0, self.width(), self.top_panel_height)
-        self.top_panel.stackUnder(self.stats_label)
         self.blur_background()
         
+        if not self._bottom_built:
+            return
         self.bottom_panel.setGeometry(0, self.height() - self.bottom_panel_height, self.width(), self.bottom_panel_height)
-        self.bottom_panel.stackUnder(self.print_label)
         self.blur_background_bottom()
     
     def _position_top_widgets(self):
@@ -772,29 +1468,35 @@ Mode: {'EDIT' if self.path_is_editing else 'FIXED'}"""
         self.stats_label.setGeometry(10, 10, 300, 80)
         
         # Solver dropdown (centered, offset left)
-        solver_width = self.solver_widget.sizeHint().width()
-        solver_height = self.solver_widget.sizeHint().height()
+        solver_hint = self._hint(self.solver_widget)
+        solver_width = solver_hint.width()
+        solver_height = solver_hint.height()
         solver_x = (self.width() - solver_width) // 2 - 150
         self.solver_widget.setGeometry(solver_x, 10, solver_width, solver_height)
         
         # Cost function dropdown (top right)
-        cost_width = self.cost_widget.sizeHint().width()
-        cost_height = self.cost_widget.sizeHint().height()
+        cost_hint = self._hint(self.cost_widget)
+        cost_width = cost_hint.width()
+        cost_height = cost_hint.height()
         cost_x = self.width() - cost_width - 10
         self.cost_widget.setGeometry(cost_x, 10, cost_width, cost_height)
         
         # Time input (top right, below cost)
-        time_width = self.time_widget.sizeHint().width()
-        time_height = self.time_widget.sizeHint().height()
+        time_hint = self._hint(self.time_widget)
+        time_width = time_hint.width()
+        time_height = time_hint.height()
         time_x = self.width() - time_width - 10
         time_y = 10 + cost_height + 5
         self.time_widget.setGeometry(time_x, time_y, time_width, time_height)
     
     def _position_bottom_widgets(self):
         """Position bottom panel widgets."""
+        if not self._bottom_built:
+            return
         # Resegment controls (bottom right)
-        reseg_width = self.resegment_widget.sizeHint().width()
-        reseg_height = self.resegment_widget.sizeHint().height()
+        reseg_hint = self._hint(self.resegment_widget)
+        reseg_width = reseg_hint.width()
+        reseg_height = reseg_hint.height()
         reseg_x = self.width() - reseg_width - 10
         reseg_y = self.height() - reseg_height - 10
         self.resegment_widget.setGeometry(reseg_x, reseg_y, reseg_width, reseg_height)
@@ -804,8 +1506,9 @@ Mode: {'EDIT' if self.path_is_editing else 'FIXED'}"""
         self.print_label.setGeometry(10, print_y, 400, 30)
         
         # Solver run button (bottom center)
-        run_width = self.run_solver_widget.sizeHint().width()
-        run_height = self.run_solver_widget.sizeHint().height()
+        run_hint = self._hint(self.run_solver_widget)
+        run_width = run_hint.width()
+        run_height = run_hint.height()
         run_x = (self.width() - run_width) // 2
         run_y = self.height() - run_height - 10
         self.run_solver_widget.setGeometry(run_x, run_y, run_width, run_height)
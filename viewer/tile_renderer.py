@@ -1,15 +1,76 @@
 from PySide6.QtGui import QImage, QPixmap
+import math
+from collections import OrderedDict
 import numpy as np
 from hillshade import hillshade
+from hillshade_nb import hillshade_u8
+from numba_compat import NUMBA_AVAILABLE
 
 class TileRenderer:
-    @staticmethod
-    def render(tile_array):
+    # Shading buffer reused across tiles; QPixmap.fromImage copies the
+    # pixels out, so the QImage wrapping it never outlives a render call
+    _out_buf = None
+    # Rendered pixmaps by (tx, ty, level), most recently used last; entries
+    # remember their DEM so a different DEM never gets stale tiles. Sized to
+    # hold every 256 px tile a 4K viewport shows (about one tile pixel per
+    # screen pixel at the chosen level), with room for a pan around it
+    _pixmaps = OrderedDict()
+    max_pixmaps = 256
+
+    @classmethod
+    def _output_buffer(cls, h, w):
+        """Contiguous (h, w) uint8 view into the shared shading buffer."""
+        size = h * w
+        if cls._out_buf is None or cls._out_buf.size < size:
+            cls._out_buf = np.empty(size, dtype=np.uint8)
+        return cls._out_buf[:size].reshape(h, w)
+
+    @classmethod
+    def render(cls, tile_array, azimuth=315, altitude=45):
         if tile_array is None or tile_array.size == 0:
             return None
-        tile_float = tile_array.astype(np.float32)
-        hs = hillshade(tile_float)               # compute hillshade
-        hs_img = (hs * 255).astype(np.uint8)    # scale for display
-        h, w = hs_img.shape
+        h, w = tile_array.shape
+        hs_img = cls._output_buffer(h, w)
+        if NUMBA_AVAILABLE:
+            hillshade_u8(tile_array, math.radians(azimuth), math.radians(altitude), hs_img)
+        else:
+            tile_float = tile_array if tile_array.dtype == np.float32 else tile_array.astype(np.float32)
+            hs = hillshade(tile_float, azimuth, altitude)  # compute hillshade
+            np.multiply(hs, 255, out=hs)                   # scale for display
+            np.copyto(hs_img, hs, casting='unsafe')
         qimg = QImage(hs_img.data, w, h, w, QImage.Format.Format_Grayscale8)
         return QPixmap.fromImage(qimg)
+
+    @classmethod
+    def render_tile(cls, tile_cache, tx, ty, level=0, azimuth=315, altitude=45):
+        """Shaded pixmap for tile (tx, ty) at `level`, served from the LRU when possible."""
+        key = (tx, ty, level)
+        entry = cls._pixmaps.get(key)
+        if entry is not None and entry[0] is tile_cache.dem:
+            cls._pixmaps.move_to_end(key)
+            return entry[1]
+
+        tile = tile_cache.get_tile(tx, ty, level)
+        if tile is not None and level > 0:
+            # a decimated pixel spans 2**level DEM pixels; rescale z so slopes shade the same
+            tile = tile * (1.0 / (1 << level))
+        pixmap = cls.render(tile, azimuth, altitude)
+        if pixmap is None:
+            return None
+
+        cls._pixmaps[key] = (tile_cache.dem, pixmap)
+        cls._pixmaps.move_to_end(key)
+        while len(cls._pixmaps) > cls.max_pixmaps:
+            cls._pixmaps.popitem(last=False)
+        return pixmap
+
+    @classmethod
+    def has_pixmap(cls, tile_cache, tx, ty, level=0):
+        """True if render_tile() would serve tile (tx, ty) at `level` from the LRU."""
+        entry = cls._pixmaps.get((tx, ty, level))
+        return entry is not None and entry[0] is tile_cache.dem
+
+    @classmethod
+    def clear_cache(cls):
+        """Drop all cached pixmaps (e.g. after the DEM has changed)."""
+        cls._pixmaps.clear()